@@ -1,7 +1,7 @@
 from .ssafile import SSAFile
 from .ssaevent import SSAEvent
 from .ssastyle import SSAStyle
-from . import time, formats, cli, exceptions
+from . import time, timings, formats, cli, exceptions
 from .formats import whisper
 from .exceptions import *  # noqa: F403
 from .common import Color, Alignment, VERSION
@@ -11,6 +11,7 @@ __all__ = [
     "SSAEvent",
     "SSAStyle",
     "time",
+    "timings",
     "formats",
     "cli",
     "whisper",
@@ -19,6 +20,7 @@ __all__ = [
     "Alignment",
     "VERSION",
     "load",
+    "iter_events",
     "load_from_whisper",
     "make_time",
 ]
@@ -26,6 +28,9 @@ __all__ = [
 #: Alias for :meth:`SSAFile.load()`.
 load = SSAFile.load
 
+#: Alias for :meth:`SSAFile.iter_events()`.
+iter_events = SSAFile.iter_events
+
 #: Alias for :meth:`pysubs2.whisper.load_from_whisper()`.
 load_from_whisper = whisper.load_from_whisper
 
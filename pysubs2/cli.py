@@ -1,12 +1,14 @@
 import argparse
 import codecs
+import functools
 import os
 import re
 import os.path as op
+from concurrent.futures import ProcessPoolExecutor
 from io import TextIOWrapper
 import sys
 from textwrap import dedent
-from typing import List
+from typing import Any, Dict, List, Optional, Tuple
 
 from .formats import get_file_extension, FORMAT_IDENTIFIERS
 from .time import make_time
@@ -22,6 +24,13 @@ def positive_float(s: str) -> float:
     return x
 
 
+def non_negative_int(s: str) -> int:
+    x = int(s)
+    if x < 0:
+        raise argparse.ArgumentTypeError(f"{s!r} is not a non-negative integer")
+    return x
+
+
 def character_encoding(s: str) -> str:
     try:
         codecs.lookup(s)
@@ -42,6 +51,50 @@ def change_ext(path: str, ext: str) -> str:
     return base + ext
 
 
+class _LogRecordCollector(logging.Handler):
+    """Keeps log records of a worker process so that they can be emitted by the main process."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.records: List[logging.LogRecord] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        # make the record picklable, like logging.handlers.QueueHandler does
+        message = self.format(record)
+        record.msg = record.message = message
+        record.args = None
+        record.exc_info = None
+        record.exc_text = None
+        self.records.append(record)
+
+
+def _init_worker(log_level: int) -> None:
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.setLevel(log_level)
+
+
+def _format_error(e: Exception) -> str:
+    return f"{type(e).__name__}: {e}"
+
+
+def _convert_file_job(path: str, args: argparse.Namespace, extra_input_args: Dict[str, Any],
+                      extra_output_args: Dict[str, Any]) -> Tuple[Optional[str], List[logging.LogRecord]]:
+    """Convert one file in worker process, return error message (if any) and log records"""
+    collector = _LogRecordCollector()
+    collector.setFormatter(logging.Formatter("%(message)s"))
+    root = logging.getLogger()
+    root.addHandler(collector)
+    try:
+        Pysubs2CLI.convert_file(path, args, extra_input_args, extra_output_args)
+        return None, collector.records
+    except Exception as e:
+        return _format_error(e), collector.records
+    finally:
+        root.removeHandler(collector)
+
+
 class Pysubs2CLI:
     def __init__(self) -> None:
         parser = self.parser = argparse.ArgumentParser(formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -53,6 +106,7 @@ class Pysubs2CLI:
                                                        epilog=dedent("""
                                                        usage examples:
                                                          python -m pysubs2 --to srt *.ass
+                                                         python -m pysubs2 --to srt --jobs 0 *.ass
                                                          python -m pysubs2 --to srt --clean *.ass
                                                          python -m pysubs2 --to microdvd --fps 23.976 *.ass
                                                          python -m pysubs2 --shift 0.3s *.srt
@@ -98,6 +152,11 @@ class Pysubs2CLI:
         parser.add_argument("--clean", action="store_true",
                             help="Attempt to remove non-essential subtitles (eg. karaoke, SSA drawing tags), "
                                  "strip styling information when saving to non-SSA formats")
+        parser.add_argument("-j", "--jobs", metavar="N", type=non_negative_int, default=1,
+                            help="Process files in N parallel processes (0 means number of CPUs). By default, "
+                                 "files are processed one by one. Messages are printed in the order of input files "
+                                 "regardless of this option. With N other than 1, a file which fails to convert "
+                                 "is reported and the others are still processed.")
         parser.add_argument("--verbose", action="store_true",
                             help="Print misc logging")
 
@@ -156,37 +215,29 @@ class Pysubs2CLI:
         logging.debug("Extra arguments to SSAFile.from_file(): %r", extra_input_args)
         logging.debug("Extra arguments to SSAFile.to_file(): %r", extra_output_args)
 
-        if args.files:
+        jobs = args.jobs or os.cpu_count() or 1
+
+        if args.files and jobs > 1 and len(args.files) > 1:
+            errors += self.convert_files_parallel(args.files, args, extra_input_args, extra_output_args, jobs)
+        elif args.files:
             for path in args.files:
-                if not op.exists(path):
-                    print("Skipping", path, "(does not exist)")
+                skip_reason = self.check_input_path(path)
+                if skip_reason is not None:
+                    print("Skipping", path, f"({skip_reason})")
                     errors += 1
-                elif not op.isfile(path):
-                    print("Skipping", path, "(not a file)")
+                    continue
+
+                if args.jobs == 1:
+                    # default, errors propagate like before --jobs was added
+                    self.convert_file(path, args, extra_input_args, extra_output_args)
+                    continue
+
+                # --jobs was given but there is nothing to parallelize, report errors like convert_files_parallel()
+                try:
+                    self.convert_file(path, args, extra_input_args, extra_output_args)
+                except Exception as e:
+                    print("Failed to convert", path, f"({_format_error(e)})", file=sys.stderr)
                     errors += 1
-                else:
-                    with open(path, encoding=args.input_enc, errors=args.enc_error_handling) as infile:
-                        subs = SSAFile.from_file(infile, args.input_format, args.fps, **extra_input_args)
-
-                    self.process(subs, args)
-
-                    if args.output_format is None:
-                        outpath = path
-                        output_format = subs.format
-                        assert output_format is not None, "subs.format must not be None (it was read from file)"
-                    else:
-                        ext = get_file_extension(args.output_format)
-                        outpath = change_ext(path, ext)
-                        output_format = args.output_format
-                        assert output_format is not None, "args.output_format must not be None (see if/else)"
-
-                    if args.output_dir is not None:
-                        _, filename = op.split(outpath)
-                        outpath = op.join(args.output_dir, filename)
-
-                    with open(outpath, "w", encoding=args.output_enc, errors=args.enc_error_handling) as outfile:
-                        subs.to_file(outfile, output_format, args.fps, apply_styles=not args.clean,
-                                     **extra_output_args)
         elif not sys.stdin.isatty():
             infile = TextIOWrapper(sys.stdin.buffer, encoding=args.input_enc, errors=args.enc_error_handling)
             outfile = TextIOWrapper(sys.stdout.buffer, encoding=args.output_enc, errors=args.enc_error_handling)
@@ -202,6 +253,74 @@ class Pysubs2CLI:
 
         return 0 if errors == 0 else 1
 
+    def convert_files_parallel(self, paths: List[str], args: argparse.Namespace, extra_input_args: Dict[str, Any],
+                               extra_output_args: Dict[str, Any], jobs: int) -> int:
+        """Convert files using process pool, return number of errors"""
+        errors = 0
+        skip_reasons = [self.check_input_path(path) for path in paths]
+        valid_paths = [path for path, reason in zip(paths, skip_reasons) if reason is None]
+        job = functools.partial(_convert_file_job, args=args, extra_input_args=extra_input_args,
+                                extra_output_args=extra_output_args)
+        chunksize = max(1, min(64, len(valid_paths) // (4 * jobs)))
+
+        executor = ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                                       initargs=(logging.getLogger().getEffectiveLevel(),))
+        try:
+            # results come in order of input files, which keeps our output deterministic
+            results = executor.map(job, valid_paths, chunksize=chunksize)
+            for path, skip_reason in zip(paths, skip_reasons):
+                if skip_reason is not None:
+                    print("Skipping", path, f"({skip_reason})")
+                    errors += 1
+                    continue
+
+                error, records = next(results)
+                for record in records:
+                    logging.getLogger(record.name).handle(record)
+                if error is not None:
+                    print("Failed to convert", path, f"({error})", file=sys.stderr)
+                    errors += 1
+        finally:
+            executor.shutdown(cancel_futures=True)
+
+        return errors
+
+    @staticmethod
+    def check_input_path(path: str) -> Optional[str]:
+        """Return reason why given input path cannot be processed, or None"""
+        if not op.exists(path):
+            return "does not exist"
+        elif not op.isfile(path):
+            return "not a file"
+        else:
+            return None
+
+    @classmethod
+    def convert_file(cls, path: str, args: argparse.Namespace, extra_input_args: Dict[str, Any],
+                     extra_output_args: Dict[str, Any]) -> None:
+        with open(path, encoding=args.input_enc, errors=args.enc_error_handling) as infile:
+            subs = SSAFile.from_file(infile, args.input_format, args.fps, **extra_input_args)
+
+        cls.process(subs, args)
+
+        if args.output_format is None:
+            outpath = path
+            output_format = subs.format
+            assert output_format is not None, "subs.format must not be None (it was read from file)"
+        else:
+            ext = get_file_extension(args.output_format)
+            outpath = change_ext(path, ext)
+            output_format = args.output_format
+            assert output_format is not None, "args.output_format must not be None (see if/else)"
+
+        if args.output_dir is not None:
+            _, filename = op.split(outpath)
+            outpath = op.join(args.output_dir, filename)
+
+        with open(outpath, "w", encoding=args.output_enc, errors=args.enc_error_handling) as outfile:
+            subs.to_file(outfile, output_format, args.fps, apply_styles=not args.clean,
+                         **extra_output_args)
+
     @staticmethod
     def process(subs: SSAFile, args: argparse.Namespace) -> None:
         if args.shift is not None:
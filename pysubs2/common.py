@@ -1,5 +1,12 @@
+import codecs
+import dataclasses
+import functools
+import hashlib
+import io
+import mmap
+import operator
 from dataclasses import dataclass
-from typing import Tuple, Union, Optional, Dict, Iterable, Iterator
+from typing import Tuple, Union, Optional, Dict, Iterable, Iterator, TextIO, Type, TypeVar, Sequence, Callable, Any, overload, cast
 from enum import IntEnum
 import xml.etree.ElementTree as ET
 from contextlib import contextmanager
@@ -65,6 +72,321 @@ VERSION = "1.8.0"
 
 IntOrFloat = Union[int, float]
 
+T = TypeVar("T")
+
+
+@overload
+def dataclass_add_slots(cls: Type[T]) -> Type[T]: ...
+
+
+@overload
+def dataclass_add_slots(*, extra_slots: Tuple[str, ...]) -> Callable[[Type[T]], Type[T]]: ...
+
+
+def dataclass_add_slots(cls: Optional[Type[T]] = None, *,
+                        extra_slots: Tuple[str, ...] = ()) -> Union[Type[T], Callable[[Type[T]], Type[T]]]:
+    """
+    Class decorator which makes dataclass use ``__slots__`` instead of instance ``__dict__``
+
+    This is equivalent to ``@dataclass(slots=True)`` which is only available since Python 3.10.
+    Must be applied on top of the ``@dataclass`` decorator. Instances remain weak-referenceable
+    and picklable with all pickle protocols.
+
+    Use as ``@dataclass_add_slots(extra_slots=(...))`` to add slots for attributes
+    which are not dataclass fields (eg. private caches, set them in ``__post_init__``).
+
+    """
+    if cls is None:
+        return lambda cls_: _dataclass_add_slots(cls_, extra_slots)
+    return _dataclass_add_slots(cls, extra_slots)
+
+
+def _dataclass_add_slots(cls: Type[T], extra_slots: Tuple[str, ...]) -> Type[T]:
+    field_names = tuple(field.name for field in dataclasses.fields(cls))  # type: ignore[arg-type]
+    cls_dict = dict(cls.__dict__)
+    cls_dict["__slots__"] = (*field_names, *extra_slots, "__weakref__")
+    for name in field_names:
+        # remove default values from class namespace, they would conflict with slots (defaults live in __init__)
+        cls_dict.pop(name, None)
+    cls_dict.pop("__dict__", None)
+    cls_dict.pop("__weakref__", None)
+    # pickle protocols 0 and 1 refuse classes with __slots__ unless they define __getstate__
+    cls_dict.setdefault("__getstate__", _slots_getstate)
+    cls_dict.setdefault("__setstate__", _slots_setstate)
+
+    metaclass: Type[type] = type(cls)
+    new_cls = cast(Type[T], metaclass(cls.__name__, cls.__bases__, cls_dict))
+    new_cls.__qualname__ = cls.__qualname__
+    return new_cls
+
+
+def _slots_getstate(self: Any) -> Dict[str, Any]:
+    return {name: getattr(self, name) for name in self.__slots__ if name != "__weakref__" and hasattr(self, name)}
+
+
+def _slots_setstate(self: Any, state: Dict[str, Any]) -> None:
+    for name, value in state.items():
+        setattr(self, name, value)
+
+
+_FIELD_GETTERS: Dict[type, Callable[[Any], Tuple[Any, ...]]] = {}
+
+
+def _make_field_getter(cls: type) -> Callable[[Any], Tuple[Any, ...]]:
+    names = [field.name for field in dataclasses.fields(cls)]
+    getter = operator.attrgetter(*names)
+    return getter if len(names) > 1 else lambda obj: (getter(obj),)
+
+
+def dataclass_field_values(obj: Any) -> Tuple[Any, ...]:
+    """Return tuple of field values of dataclass instance (unlike ``dataclasses.astuple()``, values are not copied)"""
+    cls = type(obj)
+    try:
+        getter = _FIELD_GETTERS[cls]
+    except KeyError:
+        getter = _FIELD_GETTERS[cls] = _make_field_getter(cls)
+    return getter(obj)
+
+
+def _canonical_value(value: Any) -> Any:
+    cls = type(value)
+    if cls is str or cls is int:
+        return value
+    elif isinstance(value, Color):
+        return value.r, value.g, value.b, value.a
+    elif isinstance(value, float) and value.is_integer():
+        return int(value)
+    elif isinstance(value, int):
+        return int(value)  # bool, IntEnum
+    else:
+        return value
+
+
+def canonical_field_values(obj: Any) -> Tuple[Any, ...]:
+    """
+    Return field values of dataclass instance as builtin types, for use with :func:`stable_hash()`
+
+    Booleans, integral floats and enums become ``int`` (so that ``True``, ``1.0`` and ``1``,
+    which compare equal, give the same result) and :class:`Color` becomes ``(r, g, b, a)`` tuple.
+
+    """
+    return tuple(map(_canonical_value, dataclass_field_values(obj)))
+
+
+def stable_hash(parts: Iterable[Any]) -> int:
+    """
+    Return 64-bit BLAKE2 digest of ``repr()`` of given parts
+
+    Unlike builtin ``hash()``, this is the same in all Python processes, provided that parts
+    consist of builtin types (tuples, strings, integers, etc.) which have deterministic ``repr()``.
+
+    """
+    h = hashlib.blake2b(digest_size=8)
+    for part in parts:
+        h.update(repr(part).encode("utf-8"))
+    return int.from_bytes(h.digest(), "big")
+
+
+def write_chunked(fp: TextIO, strings: Iterable[str], chunk_size: int = 65536) -> None:
+    """
+    Write strings to file, joining them into chunks of approximately ``chunk_size`` characters
+
+    This is much faster than calling ``print()`` or ``fp.write()`` for each line, while keeping
+    memory use bounded (as opposed to joining the whole output into one string).
+
+    """
+    buffer = []
+    buffer_length = 0
+    for s in strings:
+        buffer.append(s)
+        buffer_length += len(s)
+        if buffer_length >= chunk_size:
+            fp.write("".join(buffer))
+            buffer.clear()
+            buffer_length = 0
+
+    if buffer:
+        fp.write("".join(buffer))
+
+
+class PrefixedTextIO(io.TextIOBase, TextIO):
+    """
+    Read-only text stream which returns given prefix, followed by the rest of another stream
+
+    This is used to "un-read" the beginning of a stream which cannot seek back, like a pipe.
+    It implements the reading part of :class:`typing.TextIO` interface, so that it can be
+    passed to format readers.
+
+    """
+
+    def __init__(self, prefix: str, fp: TextIO) -> None:
+        super().__init__()
+        self._prefix: Optional[io.StringIO] = io.StringIO(prefix)
+        self._fp = fp
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: Optional[int] = -1) -> str:
+        if size is None:
+            size = -1
+        data = ""
+        if self._prefix is not None:
+            data = self._prefix.read(size)
+            if size < 0 or len(data) < size:
+                self._prefix = None  # prefix is exhausted, let it go
+            if size >= 0:
+                size -= len(data)
+                if size == 0:
+                    return data
+        return data + self._fp.read(size)
+
+    # same signature as TextIOBase.readline() in typeshed, which also has to ignore the bytes-based IOBase.readline()
+    def readline(self, size: int = -1, /) -> str:  # type: ignore[override]
+        line = ""
+        if self._prefix is not None:
+            line = self._prefix.readline(size)
+            if line.endswith("\n") or (size >= 0 and len(line) == size):
+                return line
+            self._prefix = None
+            if size >= 0:
+                size -= len(line)
+        return line + self._fp.readline(size)
+
+
+def peek_text(fp: TextIO, size: int) -> Tuple[str, TextIO]:
+    """
+    Read up to ``size`` characters from the beginning of stream without consuming them
+
+    Returns:
+        Tuple ``(fragment, fp)``, where ``fp`` is the file object to continue reading from. For seekable
+        streams, this is the original file object (which is seeked back), otherwise it is
+        :class:`PrefixedTextIO` wrapping the original stream, so that only the fragment is kept in memory.
+
+    """
+    try:
+        position = fp.tell() if fp.seekable() else None
+    except (AttributeError, OSError, ValueError):
+        position = None  # eg. tell() is disabled by iteration
+
+    fragment = fp.read(size)
+    if position is not None:
+        fp.seek(position)
+        return fragment, fp
+    else:
+        return fragment, PrefixedTextIO(fragment, fp)
+
+
+#: Binary data which can be parsed by :meth:`pysubs2.SSAFile.from_bytes()`.
+ByteBuffer = Union[bytes, bytearray, mmap.mmap]
+
+#: Encodings tried by :func:`detect_encoding()` (in this order) when the data has no byte order mark.
+DEFAULT_ENCODING_CANDIDATES: Tuple[str, ...] = ("utf-8", "cp1252")
+
+#: Number of bytes from the beginning of data which :func:`detect_encoding()` tries to decode.
+ENCODING_DETECTION_PREFIX_SIZE = 65536
+
+# UTF-32 LE must be checked before UTF-16 LE, whose byte order mark is a prefix of it
+_BOM_ENCODINGS = (
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+
+
+def detect_encoding(data: ByteBuffer, candidates: Sequence[str] = DEFAULT_ENCODING_CANDIDATES) -> str:
+    """
+    Guess character encoding of given data
+
+    If the data starts with a byte order mark (BOM), the corresponding Unicode encoding is returned
+    (eg. ``"utf-8-sig"``, which skips the BOM when decoding). Otherwise, the first of candidate encodings
+    which decodes the first :data:`ENCODING_DETECTION_PREFIX_SIZE` bytes without error is returned.
+    When none of them does, the first candidate is returned.
+
+    Note that single-byte encodings like ``"cp1252"`` accept almost any data, so they should come
+    after encodings which can be validated (like ``"utf-8"``) in the candidate list; of several
+    single-byte encodings, only the first one is likely to be chosen.
+
+    Arguments:
+        data: Beginning of the file (or all of it). If it is longer than
+            :data:`ENCODING_DETECTION_PREFIX_SIZE`, the rest is ignored.
+        candidates: Encodings to try.
+
+    Raises:
+        ValueError: No candidate encodings given.
+
+    """
+    if not candidates:
+        raise ValueError("No candidate encodings given")
+
+    head = data[:4]
+    for bom, encoding in _BOM_ENCODINGS:
+        if head.startswith(bom):
+            return encoding
+
+    prefix = data[:ENCODING_DETECTION_PREFIX_SIZE]
+    # when the prefix is cut in the middle of a multi-byte character, it's not an error
+    final = len(prefix) == len(data)
+    for encoding in candidates:
+        decoder = codecs.getincrementaldecoder(encoding)("strict")
+        try:
+            decoder.decode(prefix, final=final)
+        except UnicodeDecodeError:
+            continue
+        return encoding
+
+    return candidates[0]
+
+
+@functools.lru_cache(maxsize=None)
+def is_ascii_compatible(encoding: str) -> bool:
+    """Return True if ASCII characters are encoded as single bytes of the same value, like in UTF-8"""
+    ascii_chars = "".join(map(chr, range(128)))
+    try:
+        return bytes(range(128)).decode(encoding) == ascii_chars and ascii_chars.encode(encoding) == bytes(range(128))
+    except (UnicodeError, LookupError):
+        return False
+
+
+def can_split_lines(buffer: ByteBuffer, encoding: str) -> bool:
+    """
+    Return True if lines of encoded text can be found by looking for ``b"\\n"`` in the buffer
+
+    This is the case for ASCII-compatible encodings (UTF-8, Windows code pages, etc.), unless
+    the text uses old Mac-style ``"\\r"`` line endings.
+
+    """
+    head = buffer[:ENCODING_DETECTION_PREFIX_SIZE]
+    return is_ascii_compatible(encoding) and not (b"\r" in head and b"\n" not in head)
+
+
+def iter_buffer_lines(buffer: ByteBuffer, encoding: str, errors: str = "strict", start: int = 0,
+                      end: Optional[int] = None, chunk_size: int = 1 << 20) -> Iterator[str]:
+    """
+    Decode lines of text in a binary buffer, like iterating over a file opened in text mode (with universal newlines)
+
+    The buffer (or its part from ``start`` to ``end``) is decoded in chunks of about ``chunk_size`` bytes
+    which end at a line break, this requires that :func:`can_split_lines()` holds.
+
+    """
+    decoder = codecs.getincrementaldecoder(encoding)(errors)
+    size = len(buffer) if end is None else end
+    position = start
+    while position < size:
+        chunk_end = buffer.find(b"\n", position + chunk_size, size)
+        chunk_end = size if chunk_end == -1 else chunk_end + 1
+        text = decoder.decode(buffer[position:chunk_end], final=chunk_end == size)
+        position = chunk_end
+        if "\r" in text:
+            text = text.replace("\r\n", "\n").replace("\r", "\n")
+        lines = text.split("\n")
+        last = lines.pop()
+        yield from [line + "\n" for line in lines]
+        if last:
+            yield last
+
 
 def etree_iter_child_nodes(elem: ET.Element) -> Iterator[Union[ET.Element, str]]:
     """
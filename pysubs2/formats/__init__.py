@@ -1,4 +1,7 @@
-from typing import Dict, Type
+import logging
+import re
+from time import perf_counter
+from typing import Dict, Type, Optional, List, NamedTuple
 
 from .base import FormatBase
 from .microdvd import MicroDVDFormat
@@ -44,6 +47,9 @@ FORMAT_IDENTIFIER_TO_FORMAT_CLASS: Dict[str, Type[FormatBase]] = {
 
 FORMAT_IDENTIFIERS = list(FORMAT_IDENTIFIER_TO_FORMAT_CLASS.keys())
 
+#: Beginning of SubRip file, ie. number and timestamps of the first subtitle.
+SUBRIP_SIGNATURE = re.compile(r"\d+[ \t]*\r?\n[ \t]*\d{1,2}:\d{1,2}:\d{1,2}[.,]\d{1,3}[ \t]*-->")
+
 
 def get_format_class(format_: str) -> Type[FormatBase]:
     """Format identifier -> format class (ie. subclass of FormatBase)"""
@@ -74,7 +80,23 @@ def get_file_extension(format_: str) -> str:
 
 
 def autodetect_format(content: str) -> str:
-    """Return format identifier for given fragment or raise FormatAutodetectionError."""
+    """
+    Return format identifier for given fragment or raise FormatAutodetectionError.
+
+    Formats with a distinctive beginning (eg. ``WEBVTT`` or ``[Script Info]``) are recognized
+    right away, otherwise the fragment is given to :meth:`FormatBase.guess_format()` of all formats
+    and exactly one of them must recognize it. See :func:`autodetect_format_timings()` for
+    diagnosing slow or failing detection.
+
+    .. versionchanged:: 1.9.0
+       Check distinctive beginnings of formats first; a leading byte order mark is ignored.
+
+    """
+    format_ = _guess_format_by_signature(content)
+    if format_ is not None:
+        return format_
+
+    logging.debug("no format signature found, trying all formats")
     formats = set()
     for impl in FORMAT_IDENTIFIER_TO_FORMAT_CLASS.values():
         guess = impl.guess_format(content)
@@ -87,3 +109,53 @@ def autodetect_format(content: str) -> str:
         raise FormatAutodetectionError(content=content, formats=[])
     else:
         raise FormatAutodetectionError(content=content, formats=list(formats))
+
+
+class FormatGuessTiming(NamedTuple):
+    """Result of format guess for one format implementation, see :func:`autodetect_format_timings()`."""
+    format_class: Type[FormatBase]
+    guess: Optional[str]  #: Format identifier returned by :meth:`FormatBase.guess_format()`
+    seconds: float  #: Time spent in :meth:`FormatBase.guess_format()`
+
+
+def autodetect_format_timings(content: str) -> List[FormatGuessTiming]:
+    """
+    Run format guess of all format implementations for given fragment and measure their time.
+
+    This is meant for diagnostics, eg. when autodetection is slow or fails for some files;
+    unlike :func:`autodetect_format()`, all formats are always tried.
+
+    Example:
+        >>> for result in autodetect_format_timings(text):
+        ...     print(f"{result.format_class.__name__:20} {result.guess!s:10} {result.seconds * 1000:.3f} ms")
+
+    .. versionadded:: 1.9.0
+
+    """
+    output = []
+    for impl in dict.fromkeys(FORMAT_IDENTIFIER_TO_FORMAT_CLASS.values()):
+        t0 = perf_counter()
+        guess = impl.guess_format(content)
+        output.append(FormatGuessTiming(impl, guess, perf_counter() - t0))
+    return output
+
+
+def _guess_format_by_signature(content: str) -> Optional[str]:
+    """Recognize formats by their beginning, return format identifier or None if not sure"""
+    text = content.lstrip("\ufeff \t\r\n")
+    impl: Optional[Type[FormatBase]] = None
+    if text.startswith("WEBVTT"):
+        impl = WebVTTFormat
+    elif text.startswith("[Script Info]"):
+        impl = SubstationFormat
+    elif text.startswith("<SAMI"):
+        impl = SAMIFormat
+    elif text.startswith(("<?xml", "<tt")):
+        impl = TTMLFormat
+    elif text.startswith("{\""):
+        impl = JSONFormat
+    elif SUBRIP_SIGNATURE.match(text):
+        impl = SubripFormat
+
+    # the format still has the final word, eg. SubStation needs to tell "ass" from "ssa"
+    return impl.guess_format(text) if impl is not None else None
@@ -1,4 +1,7 @@
-from typing import Optional, Any, TextIO
+import io
+from typing import Optional, Any, TextIO, Iterator
+from ..common import ByteBuffer
+from ..ssaevent import SSAEvent
 from ..ssafile import SSAFile
 
 
@@ -40,6 +43,58 @@ class FormatBase:
         """
         raise NotImplementedError("Parsing is not supported for this format")
 
+    @classmethod
+    def iter_events(cls, subs: "SSAFile", fp: TextIO, format_: str, **kwargs: Any) -> Iterator[SSAEvent]:
+        """
+        Read subtitle file, yielding events one by one instead of storing them.
+
+        This is the streaming counterpart of :meth:`FormatBase.from_file()`. Everything
+        except events (info, styles, etc.) is stored into ``subs`` as it is read,
+        while events are yielded and ``subs.events`` is left empty.
+
+        The default implementation reads the whole file using :meth:`FormatBase.from_file()`
+        and then yields the events. Formats which can do better should override this method.
+
+        Arguments:
+            subs (SSAFile): An empty :class:`SSAFile`.
+            fp (file object): Text file object, the subtitle file.
+            format_ (str): Format identifier.
+            kwargs: Extra options, eg. `fps`.
+
+        Returns:
+            Iterator of :class:`SSAEvent`
+
+        """
+        cls.from_file(subs, fp, format_, **kwargs)
+        events = subs.events
+        subs.events = []
+        yield from events
+
+    @classmethod
+    def from_buffer(cls, subs: "SSAFile", buffer: ByteBuffer, format_: str, encoding: str,
+                    errors: Optional[str] = None, **kwargs: Any) -> None:
+        """
+        Load subtitle file from binary data into an empty SSAFile.
+
+        This is used by :meth:`SSAFile.from_bytes()` and memory-mapped :meth:`SSAFile.load()`.
+        The default implementation decodes the whole buffer and calls :meth:`FormatBase.from_file()`.
+        Formats which can find subtitles in the binary data and decode only the relevant parts
+        should override this method.
+
+        Arguments:
+            subs (SSAFile): An empty :class:`SSAFile`.
+            buffer: The subtitle file, eg. ``bytes`` or :class:`mmap.mmap`.
+            format_ (str): Format identifier.
+            encoding (str): Character encoding of the file.
+            errors (Optional[str]): Error handling for character encoding, see :meth:`SSAFile.load()`.
+            kwargs: Extra options, eg. `fps`.
+
+        .. versionadded:: 1.9.0
+
+        """
+        text = str(buffer, encoding, errors or "strict")
+        cls.from_file(subs, io.StringIO(text, newline=None), format_, **kwargs)
+
     @classmethod
     def to_file(cls, subs: "SSAFile", fp: TextIO, format_: str, **kwargs: Any) -> None:
         """
@@ -1,18 +1,62 @@
 import re
 import warnings
-from typing import List, Sequence, Optional, TextIO, Any, Tuple
+from typing import List, Sequence, Optional, TextIO, Any, Iterator, Iterable, Callable
 
 from .base import FormatBase
 from ..ssaevent import SSAEvent
 from ..ssastyle import SSAStyle
 from .substation import parse_tags
-from ..time import ms_to_times, make_time, TIMESTAMP, timestamp_to_ms
+from ..time import ms_to_times, memoize_timestamp_format, make_time, TIMESTAMP, timestamp_to_ms
 from ..ssafile import SSAFile
+from ..common import ByteBuffer, can_split_lines, iter_buffer_lines, write_chunked
 
 
 #: Largest timestamp allowed in SubRip, ie. 99:59:59,999.
 MAX_REPRESENTABLE_TIME = make_time(h=100) - 1
 
+SUBTITLE_NUMBER_LINE = re.compile(r"\s*\d+\s*$")
+NEXT_SUBTITLE_NUMBER = re.compile(r"\n+ *\d+ *$")
+HTML_STYLE_TAG = re.compile(r"< *(/ *)?([ibsu]) *>")
+HTML_TAG = re.compile(r"< */? *[a-zA-Z][^>]*>")
+MULTIPLE_NEWLINES = re.compile(r"\n+")
+
+
+def _html_style_tag_to_ssa(m: "re.Match[str]") -> str:
+    # eg. "<i>" -> "{\i1}", "</i>" -> "{\i0}"
+    return f"{{\\{m.group(2)}{'0' if m.group(1) else '1'}}}"
+
+
+def _get_text_preparer(keep_html_tags: bool, keep_unknown_html_tags: bool) -> Callable[[List[str]], str]:
+    """Return function converting lines following a timestamp line to SubStation text"""
+    strip_html_tags = not (keep_html_tags or keep_unknown_html_tags)
+
+    def prepare_text(lines: List[str]) -> str:
+        # Handle the "happy" empty subtitle case, which is timestamp line followed by blank line(s)
+        # followed by number line and timestamp line of the next subtitle. Fixes issue #11.
+        if (len(lines) >= 2
+                and not any(line.strip() for line in lines[:-1])
+                and SUBTITLE_NUMBER_LINE.match(lines[-1])):
+            return ""
+
+        # Handle the general case.
+        s = "".join(lines).strip()
+        if s[-1:].isdigit():
+            s = NEXT_SUBTITLE_NUMBER.sub("", s)
+        if "<" in s:
+            if not keep_html_tags:
+                s = HTML_STYLE_TAG.sub(_html_style_tag_to_ssa, s)
+            if strip_html_tags:
+                s = HTML_TAG.sub("", s)
+        return s.replace("\n", r"\N")  # convert newlines
+
+    return prepare_text
+
+
+@memoize_timestamp_format
+def _format_timestamp(ms: int) -> str:
+    h, m, s, ms = ms_to_times(ms)
+    return f"{h:02d}:{m:02d}:{s:02d},{ms:03d}"
+
 
 class SubripFormat(FormatBase):
     """SubRip Text (SRT) subtitle format implementation"""
@@ -26,8 +70,7 @@ class SubripFormat(FormatBase):
         if ms > MAX_REPRESENTABLE_TIME:
             warnings.warn("Overflow in SubRip timestamp, clamping to MAX_REPRESENTABLE_TIME", RuntimeWarning)
             ms = MAX_REPRESENTABLE_TIME
-        h, m, s, ms = ms_to_times(ms)
-        return f"{h:02d}:{m:02d}:{s:02d},{ms:03d}"
+        return _format_timestamp(ms)
 
     @staticmethod
     def timestamp_to_ms(groups: Sequence[str]) -> int:
@@ -77,47 +120,66 @@ class SubripFormat(FormatBase):
                 If False, these other HTML tags will be stripped from output
                 (in the previous example, you would get only ``example {\\i1}text{\\i0}``).
         """
-        timestamps: List[Tuple[int, int]] = [] # (start, end)
-        following_lines: List[List[str]] = [] # contains lists of lines following each timestamp
-
-        for line in fp:
-            stamps = cls.TIMESTAMP.findall(line)
-            if len(stamps) == 2: # timestamp line
-                start, end = map(cls.timestamp_to_ms, stamps)
-                timestamps.append((start, end))
-                following_lines.append([])
+        subs.events.extend(cls.iter_events(subs, fp, format_, keep_html_tags=keep_html_tags,
+                                           keep_unknown_html_tags=keep_unknown_html_tags, **kwargs))
+
+    @classmethod
+    def iter_events(cls, subs: "SSAFile", fp: TextIO, format_: str, keep_html_tags: bool = False,
+                    keep_unknown_html_tags: bool = False, **kwargs: Any) -> Iterator[SSAEvent]:
+        """
+        See :meth:`pysubs2.formats.FormatBase.iter_events()`
+
+        Subtitles are parsed one by one as the file is read, see :meth:`SubripFormat.from_file()` for
+        supported options.
+
+        .. versionadded:: 1.9.0
+
+        """
+        return cls._parse_lines(fp, keep_html_tags, keep_unknown_html_tags)
+
+    @classmethod
+    def _parse_lines(cls, lines: Iterable[str], keep_html_tags: bool,
+                     keep_unknown_html_tags: bool) -> Iterator[SSAEvent]:
+        timestamp = cls.TIMESTAMP
+        timestamp_to_ms = cls.timestamp_to_ms
+        prepare_text = _get_text_preparer(keep_html_tags, keep_unknown_html_tags)
+
+        start = end = -1
+        text_lines: List[str] = []  # lines following the last timestamp line
+
+        for line in lines:
+            stamps = timestamp.findall(line) if ":" in line else None
+            if stamps and len(stamps) == 2:  # timestamp line
+                if start != -1:
+                    yield SSAEvent(start=start, end=end, text=prepare_text(text_lines))
+                start, end = map(timestamp_to_ms, stamps)
+                text_lines = []
             else:
-                if timestamps:
-                    following_lines[-1].append(line)
-
-        def prepare_text(lines: List[str]) -> str:
-            # Handle the "happy" empty subtitle case, which is timestamp line followed by blank line(s)
-            # followed by number line and timestamp line of the next subtitle. Fixes issue #11.
-            if (len(lines) >= 2
-                    and all(re.match(r"\s*$", line) for line in lines[:-1])
-                    and re.match(r"\s*\d+\s*$", lines[-1])):
-                return ""
-
-            # Handle the general case.
-            s = "".join(lines).strip()
-            s = re.sub(r"\n+ *\d+ *$", "", s) # strip number of next subtitle
-            if not keep_html_tags:
-                s = re.sub(r"< *i *>", r"{\\i1}", s)
-                s = re.sub(r"< */ *i *>", r"{\\i0}", s)
-                s = re.sub(r"< *s *>", r"{\\s1}", s)
-                s = re.sub(r"< */ *s *>", r"{\\s0}", s)
-                s = re.sub(r"< *u *>", r"{\\u1}", s)
-                s = re.sub(r"< */ *u *>", r"{\\u0}", s)
-                s = re.sub(r"< *b *>", r"{\\b1}", s)
-                s = re.sub(r"< */ *b *>", r"{\\b0}", s)
-            if not (keep_html_tags or keep_unknown_html_tags):
-                s = re.sub(r"< */? *[a-zA-Z][^>]*>", "", s) # strip other HTML tags
-            s = re.sub(r"\n", r"\\N", s) # convert newlines
-            return s
-
-        for (start, end), lines in zip(timestamps, following_lines):
-            e = SSAEvent(start=start, end=end, text=prepare_text(lines))
-            subs.append(e)
+                text_lines.append(line)
+
+        if start != -1:
+            yield SSAEvent(start=start, end=end, text=prepare_text(text_lines))
+
+    @classmethod
+    def from_buffer(cls, subs: "SSAFile", buffer: ByteBuffer, format_: str, encoding: str,
+                    errors: Optional[str] = None, keep_html_tags: bool = False,
+                    keep_unknown_html_tags: bool = False, **kwargs: Any) -> None:
+        """
+        See :meth:`pysubs2.formats.FormatBase.from_buffer()`
+
+        The buffer is decoded in chunks, so that the whole file is never held in memory as text.
+        See :meth:`SubripFormat.from_file()` for supported options.
+
+        .. versionadded:: 1.9.0
+
+        """
+        if not can_split_lines(buffer, encoding):
+            super().from_buffer(subs, buffer, format_, encoding, errors, keep_html_tags=keep_html_tags,
+                                keep_unknown_html_tags=keep_unknown_html_tags, **kwargs)
+            return
+
+        lines = iter_buffer_lines(buffer, encoding, errors or "strict")
+        subs.events.extend(cls._parse_lines(lines, keep_html_tags, keep_unknown_html_tags))
 
     @classmethod
     def to_file(cls, subs: "SSAFile", fp: TextIO, format_: str, apply_styles: bool = True,
@@ -143,16 +205,25 @@ class SubripFormat(FormatBase):
                 is SRT which doesn't use line styles - this shouldn't be much
                 of an issue in practice.)
         """
+        write_chunked(fp, cls._iter_output_lines(subs, apply_styles, keep_ssa_tags))
+
+    @classmethod
+    def _iter_output_lines(cls, subs: "SSAFile", apply_styles: bool, keep_ssa_tags: bool) -> Iterator[str]:
+        styles = subs.styles
+        default_style = SSAStyle.DEFAULT_STYLE
+        ms_to_timestamp = cls.ms_to_timestamp
+
         def prepare_text(text: str, style: SSAStyle) -> str:
             text = text.replace(r"\h", " ")
             text = text.replace(r"\n", "\n")
             text = text.replace(r"\N", "\n")
 
-            body = []
-            if keep_ssa_tags:
-                body.append(text)
+            if keep_ssa_tags or "{" not in text and not (apply_styles and (
+                    style.italic or style.underline or style.strikeout)):
+                body = text  # nothing to convert
             else:
-                for fragment, sty in parse_tags(text, style, subs.styles):
+                fragments = []
+                for fragment, sty in parse_tags(text, style, styles):
                     if apply_styles:
                         if sty.italic:
                             fragment = f"<i>{fragment}</i>"
@@ -160,20 +231,18 @@ class SubripFormat(FormatBase):
                             fragment = f"<u>{fragment}</u>"
                         if sty.strikeout:
                             fragment = f"<s>{fragment}</s>"
-                    body.append(fragment)
-
-            return re.sub("\n+", "\n", "".join(body).strip())
+                    fragments.append(fragment)
+                body = "".join(fragments)
 
-        for lineno, line in enumerate(cls._get_visible_lines(subs), 1):
-            start = cls.ms_to_timestamp(line.start)
-            end = cls.ms_to_timestamp(line.end)
-            text = prepare_text(line.text, subs.styles.get(line.style, SSAStyle.DEFAULT_STYLE))
+            body = body.strip()
+            return MULTIPLE_NEWLINES.sub("\n", body) if "\n\n" in body else body
 
-            print(lineno, file=fp)
-            print(start, "-->", end, file=fp)
-            print(text, end="\n\n", file=fp)
-            lineno += 1
+        for lineno, line in enumerate(cls._iter_visible_lines(subs), 1):
+            start = ms_to_timestamp(line.start)
+            end = ms_to_timestamp(line.end)
+            text = prepare_text(line.text, styles.get(line.style, default_style))
+            yield f"{lineno}\n{start} --> {end}\n{text}\n\n"
 
     @classmethod
-    def _get_visible_lines(cls, subs: "SSAFile") -> List[SSAEvent]:
-        return subs.get_text_events()
+    def _iter_visible_lines(cls, subs: "SSAFile") -> Iterator[SSAEvent]:
+        return (line for line in subs.events if line.is_text)
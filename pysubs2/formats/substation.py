@@ -1,13 +1,17 @@
+import codecs
+import functools
 import logging
+import mmap
+import os.path
 import re
 import warnings
-from typing import Any, Union, Optional, Dict, Tuple, List, TextIO
+from typing import Any, Union, Optional, Dict, Tuple, List, TextIO, Iterator, Iterable, Callable, NamedTuple, MutableMapping
 
 from .base import FormatBase
 from ..ssaevent import SSAEvent
 from ..ssastyle import SSAStyle
-from ..common import Color, Alignment, SSA_ALIGNMENT
-from ..time import make_time, ms_to_times, timestamp_to_ms, TIMESTAMP, TIMESTAMP_SHORT
+from ..common import Color, Alignment, SSA_ALIGNMENT, write_chunked, ByteBuffer, can_split_lines, iter_buffer_lines
+from ..time import make_time, ms_to_times, memoize_timestamp_format, timestamp_to_ms, TIMESTAMP, TIMESTAMP_SHORT
 from ..ssafile import SSAFile
 
 
@@ -28,6 +32,10 @@ SECTION_HEADING = re.compile(
 
 ATTACHMENT_FILE_HEADING = re.compile(r"(fontname|filename):\s+(?P<name>\S+)")
 
+#: Start of line (after newline) which may end uuencoded attachment data, ie. blank line, attachment heading
+#: or section heading. Attachment data uses characters ``"!"`` to ``"`"``, ie. no whitespace or lowercase letters.
+ATTACHMENT_DATA_END = re.compile(rb"\n(?:[^!-`]|[^\n]{0,3}\[[^\n\]]*[a-z])")
+
 STYLE_FORMAT_LINE = {
     "ass": "Format: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, OutlineColour, BackColour, Bold, Italic,"
            " Underline, StrikeOut, ScaleX, ScaleY, Spacing, Angle, BorderStyle, Outline, Shadow, Alignment,"
@@ -85,6 +93,347 @@ def is_valid_field_content(s: str) -> bool:
     return "\n" not in s and "," not in s
 
 
+def parse_timestamp(v: str) -> int:
+    """
+    Convert SubStation timestamp (eg. ``0:01:02.34``) to milliseconds.
+
+    Handles negative timestamps as well as non-standard ones matched by
+    :data:`pysubs2.time.TIMESTAMP` or :data:`pysubs2.time.TIMESTAMP_SHORT`.
+
+    Raises:
+        ValueError: The string is not a valid timestamp.
+
+    """
+    v = v.strip()
+
+    # fast path for the usual H:MM:SS.cc timestamp (equivalent to regex-based path below)
+    if len(v) == 10 and v[1] == ":" and v[4] == ":" and v[7] == ".":
+        digits = v.replace(":", "").replace(".", "")
+        if len(digits) == 7 and digits.isdecimal():
+            x = int(digits)  # HMMSScc
+            return (x // 1000000) * 3600000 + (x // 10000 % 100) * 60000 + (x // 100 % 100) * 1000 + (x % 100) * 10
+
+    if v.startswith("-"):
+        # handle negative timestamps
+        v = v[1:]
+        sign = -1
+    else:
+        sign = 1
+
+    match = TIMESTAMP.match(v)
+    if match is None:
+        match = TIMESTAMP_SHORT.match(v)
+        if match is None:
+            raise ValueError(f"Failed to parse timestamp: {v!r}")
+
+    return sign * timestamp_to_ms(match.groups())
+
+
+def _make_field_parser(f: str, format_: str) -> Callable[[str], Any]:
+    # Per issue #45, we should handle the case where there is extra whitespace around the values.
+    # Extra whitespace is removed in non-string fields where it would break the parser otherwise,
+    # and in font name (where it doesn't really make sense). It is preserved in Dialogue string
+    # fields like Text, Name and Effect (to avoid introducing unnecessary change to parser output).
+
+    if f in {"start", "end"}:
+        return parse_timestamp
+    elif "color" in f:
+        return lambda v: rgba_to_color(v.strip())
+    elif f in {"bold", "underline", "italic", "strikeout"}:
+        return lambda v: v != "0"
+    elif f in {"borderstyle", "encoding", "marginl", "marginr", "marginv", "layer", "alphalevel"}:
+        def parse_int(v: str) -> int:
+            try:
+                return int(v)
+            except ValueError:
+                warnings.warn(f"Failed to parse {f}, using default", RuntimeWarning)
+                return 0
+        return parse_int
+    elif f in {"fontsize", "scalex", "scaley", "spacing", "angle", "outline", "shadow"}:
+        return float
+    elif f == "marked":
+        return lambda v: v.endswith("1")
+    elif f == "alignment":
+        def parse_alignment(v: str) -> Alignment:
+            try:
+                if format_ == "ass":
+                    return Alignment(int(v))
+                else:
+                    return Alignment.from_ssa_alignment(int(v))
+            except Exception:
+                warnings.warn("Failed to parse alignment, using default", RuntimeWarning)
+                return Alignment.BOTTOM_CENTER
+        return parse_alignment
+    elif f == "fontname":
+        return str.strip
+    else:
+        return str
+
+
+@functools.lru_cache(maxsize=None)
+def _get_field_parsers(fields: Tuple[str, ...], format_: str) -> List[Tuple[str, Callable[[str], Any]]]:
+    return [(f, _make_field_parser(f, format_)) for f in fields]
+
+
+def get_field_parsers(fields: List[str], format_: str) -> List[Tuple[str, Callable[[str], Any]]]:
+    """
+    Return list of (field name, parser function) pairs for given fields.
+
+    The parser functions convert field value as written in SubStation file to the corresponding
+    attribute value for :class:`pysubs2.SSAEvent` or :class:`pysubs2.SSAStyle`.
+    The result is computed once for each combination of arguments,
+    typically ``EVENT_FIELDS[format_]`` or ``STYLE_FIELDS[format_]``.
+
+    """
+    return _get_field_parsers(tuple(fields), format_)
+
+
+class AttachmentPosition(NamedTuple):
+    """Position of attachment data in a file, as given by ``tell()``."""
+    position: int
+
+
+def _read_attachment_lines(fp: TextIO, position: int) -> List[str]:
+    fp.seek(position)
+    return _collect_attachment_lines(iter(fp.readline, ""))
+
+
+def _collect_attachment_lines(source: Iterable[str]) -> List[str]:
+    lines: List[str] = []
+    for line in source:
+        line = line.strip()
+        if not line or ATTACHMENT_FILE_HEADING.match(line) or SECTION_HEADING.match(line):
+            break
+        lines.append(line)
+    return lines
+
+
+def _find_attachment_data_end(buffer: ByteBuffer, position: int) -> int:
+    """Return start of first line at or after position (start of line) which may end attachment data"""
+    m = ATTACHMENT_DATA_END.search(buffer, max(position - 1, 0))
+    if m is None:
+        return buffer.rfind(b"\n", position) + 1 or position  # last line
+    return m.start() + 1
+
+
+def _read_attachment_from_buffer(buffer: ByteBuffer, encoding: str, errors: str, position: int) -> List[str]:
+    """Like :func:`_collect_attachment_lines()` for attachment in buffer at given position"""
+    if isinstance(buffer, mmap.mmap) and buffer.closed:
+        raise ValueError("Cannot read attachment, the memory-mapped file was closed")
+    data_end = _find_attachment_data_end(buffer, position)
+    lines: List[str] = []
+    for line in iter_buffer_lines(buffer, encoding, errors, position, data_end):
+        line = line.strip()
+        if not line:
+            return lines
+        lines.append(line)
+    lines.extend(_collect_attachment_lines(_BufferLines(buffer, encoding, errors, start=data_end)))
+    return lines
+
+
+def _get_attachment_reader(fp: TextIO) -> Optional[Callable[[int], List[str]]]:
+    """Return function which reads attachment from file at given position, or None if it's not possible"""
+    try:
+        if not fp.seekable():
+            return None
+        fp.tell()
+    except (AttributeError, OSError):
+        return None
+
+    path = getattr(fp, "name", None)
+    if isinstance(path, str) and os.path.isfile(path):
+        # prefer opening the file again, since the original file object will likely get closed after reading
+        encoding, errors = fp.encoding, fp.errors
+
+        def read_from_path(position: int) -> List[str]:
+            with open(path, encoding=encoding, errors=errors) as fp2:
+                return _read_attachment_lines(fp2, position)
+
+        return read_from_path
+    else:
+        def read_from_fp(position: int) -> List[str]:
+            original_position = fp.tell()
+            try:
+                return _read_attachment_lines(fp, position)
+            finally:
+                fp.seek(original_position)
+
+        return read_from_fp
+
+
+class _BufferLines:
+    """
+    Decoded lines of text in a binary buffer, with ``tell()`` giving byte position of the next line
+
+    When ``skip_attachment_data`` is True, uuencoded data of attachments in ``[Fonts]`` and ``[Graphics]``
+    sections is skipped over (without decoding it or even splitting it into lines); only attachment
+    headings like ``fontname: ...`` are returned.
+
+    """
+
+    def __init__(self, buffer: ByteBuffer, encoding: str, errors: str, start: int = 0,
+                 skip_attachment_data: bool = False) -> None:
+        self._buffer = buffer
+        self._encoding = encoding
+        self._errors = errors
+        self._position = start
+        self._skip_attachment_data = skip_attachment_data
+
+    def tell(self) -> int:
+        return self._position
+
+    def __iter__(self) -> Iterator[str]:
+        buffer = self._buffer
+        decode = codecs.getincrementaldecoder(self._encoding)(self._errors).decode  # skips BOM only once
+        size = len(buffer)
+        inside_attachment_section = False
+
+        while self._position < size:
+            start = self._position
+            end = buffer.find(b"\n", start)
+            end = size if end == -1 else end + 1
+            self._position = end
+            line = decode(buffer[start:end], end == size)
+            yield line
+
+            if self._skip_attachment_data:
+                if "[" in line and SECTION_HEADING.match(line.strip()):
+                    inside_attachment_section = "Fonts" in line or "Graphics" in line
+                elif inside_attachment_section and ATTACHMENT_FILE_HEADING.match(line.strip()):
+                    self._position = _find_attachment_data_end(buffer, self._position)
+
+
+class LazyAttachmentDict(MutableMapping[str, List[str]]):
+    """
+    Dict of embedded fonts or images which are read from file on first access.
+
+    This is used for :attr:`pysubs2.SSAFile.fonts_opaque` and :attr:`pysubs2.SSAFile.graphics_opaque`
+    when reading SubStation file with the ``lazy_attachments`` option. It behaves like a regular
+    dict, values are lists of (uuencoded) lines like usual.
+
+    Note:
+        Attachments are read from the original file, which must not change
+        until they are accessed. When the subtitles were read from a file object
+        which is not backed by a file on disk (eg. :class:`io.StringIO`),
+        this object must not be closed.
+
+        When the file was memory-mapped (see ``use_mmap`` option of :meth:`pysubs2.SSAFile.load()`),
+        the mapping stays open until :meth:`LazyAttachmentDict.close()` is called, which can be done
+        by using the dict as a context manager.
+
+    """
+
+    def __init__(self, read_attachment: Callable[[int], List[str]]) -> None:
+        self._read_attachment = read_attachment
+        self._data: Dict[str, Union[List[str], AttachmentPosition]] = {}
+        self._close_callbacks: List[Callable[[], None]] = []
+
+    def add_close_callback(self, callback: Callable[[], None]) -> None:
+        """Register function which releases the source of attachments, see :meth:`LazyAttachmentDict.close()`."""
+        self._close_callbacks.append(callback)
+
+    def close(self) -> None:
+        """
+        Release the file which attachments are read from, eg. memory mapping of the file.
+
+        Attachments which were already accessed remain available, reading the others raises ``ValueError``.
+        Note that :attr:`pysubs2.SSAFile.fonts_opaque` and :attr:`pysubs2.SSAFile.graphics_opaque` share
+        the source, closing one of them closes both.
+
+        """
+        callbacks, self._close_callbacks = self._close_callbacks, []
+        for callback in callbacks:
+            callback()
+
+    def __enter__(self) -> "LazyAttachmentDict":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def set_position(self, key: str, position: int) -> None:
+        """Register attachment which will be read from given position when accessed."""
+        self._data[key] = AttachmentPosition(position)
+
+    def is_loaded(self, key: str) -> bool:
+        """Return True if attachment was already read from file."""
+        return not isinstance(self._data[key], AttachmentPosition)
+
+    def copy(self) -> Dict[str, List[str]]:
+        """Return a regular dict with all attachments (this reads all of them)."""
+        return dict(self.items())
+
+    def __getitem__(self, key: str) -> List[str]:
+        value = self._data[key]
+        if isinstance(value, AttachmentPosition):
+            logging.debug("reading attachment %s", key)
+            value = self._data[key] = self._read_attachment(value.position)
+        return value
+
+    def __setitem__(self, key: str, value: List[str]) -> None:
+        self._data[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        del self._data[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __repr__(self) -> str:
+        return f"<LazyAttachmentDict with {len(self)} attachments>"
+
+
+#: Maximum number of texts for which :func:`parse_tags()` remembers parsed override tags.
+PARSE_TAGS_CACHE_SIZE = 4096
+
+OVERRIDE_TAG = re.compile(r"\\[ibusp][0-9]|\\r[a-zA-Z_0-9 ]*|\\fn[a-zA-Z_0-9 ]+")
+BOOL_OVERRIDE_TAGS = {"i": "italic", "b": "bold", "u": "underline", "s": "strikeout"}
+
+#: Supported override tag of an override sequence, as ``(attribute, value)``; reset tags are
+#: represented as ``("r", style_name)``, where ``style_name`` is empty for reset to line style.
+OverrideTag = Tuple[str, Any]
+
+
+@functools.lru_cache(maxsize=PARSE_TAGS_CACHE_SIZE)
+def _split_override_sequences(text: str) -> Tuple[Tuple[str, ...], Tuple[Tuple[OverrideTag, ...], ...]]:
+    """Return fragments of text and supported tags of the override sequences between them"""
+    fragments = tuple(SSAEvent.OVERRIDE_SEQUENCE.split(text))
+    if len(fragments) == 1:
+        return fragments, ()
+
+    sequences = []
+    for overrides in SSAEvent.OVERRIDE_SEQUENCE.findall(text):
+        tags: List[OverrideTag] = []
+        for tag in OVERRIDE_TAG.findall(overrides):
+            if tag.startswith(r"\r"):
+                tags.append(("r", tag[2:]))
+            elif tag.startswith(r"\fn"):
+                tags.append(("fontname", tag[3:]))
+            elif tag[1] == "p":
+                tags.append(("drawing", int(tag[2:]) > 0))
+            else:
+                tags.append((BOOL_OVERRIDE_TAGS[tag[1]], "1" in tag))
+        sequences.append(tuple(tags))
+    return fragments, tuple(sequences)
+
+
+def _has_drawing(text: str) -> bool:
+    """Equivalent to ``any(sty.drawing for _, sty in parse_tags(text))``, without computing styles"""
+    drawing = False
+    for tags in _split_override_sequences(text)[1]:
+        for name, value in tags:
+            if name == "drawing":
+                drawing = value
+            elif name == "r" and not value:
+                drawing = False  # reset to line style, named styles are not known
+        if drawing:
+            return True
+    return False
+
+
 def parse_tags(text: str, style: SSAStyle = SSAStyle.DEFAULT_STYLE,
                styles: Optional[Dict[str, SSAStyle]] = None,
                skip_empty_fragments: bool = False) -> List[Tuple[str, SSAStyle]]:
@@ -103,58 +452,70 @@ def parse_tags(text: str, style: SSAStyle = SSAStyle.DEFAULT_STYLE,
     - i, b, u, s
     - fn
     - r (with or without style name)
+
+    Override tags of recently seen texts are cached (see :data:`PARSE_TAGS_CACHE_SIZE`),
+    which speeds up files with many repeated lines. Computed styles are created for each call,
+    but fragments with the same computed style share one :class:`SSAStyle` instance.
+
+    .. versionchanged:: 1.9.0
+       Override sequences are evaluated incrementally and parsed tags are cached.
     
     """
     if styles is None:
         styles = {}
-    
-    fragments = SSAEvent.OVERRIDE_SEQUENCE.split(text)
+
+    fragments, sequences = _split_override_sequences(text)
     if len(fragments) == 1:
         if skip_empty_fragments and not text:
             return []
         else:
             return [(text, style)]
-    
-    def apply_overrides(all_overrides: str) -> SSAStyle:
-        s = style.copy()
-        for tag in re.findall(r"\\[ibusp][0-9]|\\r[a-zA-Z_0-9 ]*|\\fn[a-zA-Z_0-9 ]+", all_overrides):
-            if tag == r"\r":
-                s = style.copy() # reset to original line style
-            elif tag.startswith(r"\r"):
-                name = tag[2:]
-                if name in styles:
-                    # reset to named style
-                    s = styles[name].copy()
-            elif tag.startswith(r"\fn"):
-                fontname = tag[3:]
-                s.fontname = fontname
-            else:
-                if "i" in tag:
-                    s.italic = "1" in tag
-                elif "b" in tag:
-                    s.bold = "1" in tag
-                elif "u" in tag:
-                    s.underline = "1" in tag
-                elif "s" in tag:
-                    s.strikeout = "1" in tag
-                elif "p" in tag:
-                    try:
-                        scale = int(tag[2:])
-                    except (ValueError, IndexError):
-                        continue
-
-                    s.drawing = scale > 0
+
+    base = style
+    changes: Dict[str, Any] = {}
+    computed_styles: Dict[Tuple[int, Tuple[Tuple[str, Any], ...]], SSAStyle] = {}
+
+    def get_computed_style() -> SSAStyle:
+        key = (id(base), tuple(changes.items()))
+        s = computed_styles.get(key)
+        if s is None:
+            s = computed_styles[key] = base.copy()
+            for name, value in changes.items():
+                setattr(s, name, value)
         return s
-    
-    overrides = SSAEvent.OVERRIDE_SEQUENCE.findall(text)
-    overrides_prefix_sum = ["".join(overrides[:i]) for i in range(len(overrides) + 1)]
-    computed_styles = map(apply_overrides, overrides_prefix_sum)
-    output = list(zip(fragments, computed_styles))
+
+    current = get_computed_style()
+    output = [(fragments[0], current)]
+    for fragment, tags in zip(fragments[1:], sequences):
+        if tags:
+            for name, value in tags:
+                if name == "r":
+                    if not value:
+                        base = style  # reset to original line style
+                        changes.clear()
+                    elif value in styles:
+                        base = styles[value]  # reset to named style
+                        changes.clear()
+                else:
+                    changes[name] = value
+            current = get_computed_style()
+        output.append((fragment, current))
+
     if skip_empty_fragments:
         output = [(fragment, sty) for fragment, sty in output if fragment]
     return output
 
 
+#: Function converting field value to string, given the value and the event/style it belongs to.
+FieldFormatter = Callable[[Any, Union[SSAEvent, SSAStyle]], str]
+
+@memoize_timestamp_format
+def _format_timestamp(ms: int) -> str:
+    h, m, s, ms = ms_to_times(ms)
+    cs = ms // 10
+    return f"{h:01d}:{m:02d}:{s:02d}.{cs:02d}"
+
+
 NOTICE = "Script generated by pysubs2\nhttps://pypi.python.org/pypi/pysubs2"
 
 class SubstationFormat(FormatBase):
@@ -171,10 +532,7 @@ class SubstationFormat(FormatBase):
 
         # Aegisub does rounding, see https://github.com/Aegisub/Aegisub/blob/6f546951b4f004da16ce19ba638bf3eedefb9f31/libaegisub/include/libaegisub/ass/time.h#L32
         round_ms = ((requested_ms + 5) - (requested_ms + 5) % 10)
-        h, m, s, ms = ms_to_times(round_ms)
-        cs = ms // 10
-
-        return f"{h:01d}:{m:02d}:{s:02d}.{cs:02d}"
+        return _format_timestamp(round_ms)
 
     @classmethod
     def guess_format(cls, text: str) -> Optional[str]:
@@ -188,74 +546,122 @@ class SubstationFormat(FormatBase):
 
     @classmethod
     def from_file(cls, subs: "SSAFile", fp: TextIO, format_: str, **kwargs: Any) -> None:
-        """See :meth:`pysubs2.formats.FormatBase.from_file()`"""
+        """
+        See :meth:`pysubs2.formats.FormatBase.from_file()`
 
-        def string_to_field(f: str, v: str) -> Any:
-            # Per issue #45, we should handle the case where there is extra whitespace around the values.
-            # Extra whitespace is removed in non-string fields where it would break the parser otherwise,
-            # and in font name (where it doesn't really make sense). It is preserved in Dialogue string
-            # fields like Text, Name and Effect (to avoid introducing unnecessary change to parser output).
+        Keyword args:
+            lazy_attachments, skip_attachments: See :meth:`SubstationFormat.iter_events()`.
 
-            if f in {"start", "end"}:
-                v = v.strip()
-                if v.startswith("-"):
-                    # handle negative timestamps
-                    v = v[1:]
-                    sign = -1
-                else:
-                    sign = 1
+        """
+        subs.events.extend(cls.iter_events(subs, fp, format_, **kwargs))
 
-                m = TIMESTAMP.match(v)
-                if m is None:
-                    m = TIMESTAMP_SHORT.match(v)
-                    if m is None:
-                        raise ValueError(f"Failed to parse timestamp: {v!r}")
+    @classmethod
+    def iter_events(cls, subs: "SSAFile", fp: TextIO, format_: str, lazy_attachments: bool = False,
+                    skip_attachments: bool = False, **kwargs: Any) -> Iterator[SSAEvent]:
+        """
+        See :meth:`pysubs2.formats.FormatBase.iter_events()`
+
+        Events are parsed lazily, one ``Dialogue:`` or ``Comment:`` line at a time, so memory use
+        does not depend on the number of events. Sections preceding ``[Events]`` (which is where they
+        are in well-formed files) are stored into ``subs`` before the first event is yielded.
+
+        Keyword args:
+            lazy_attachments: If True, embedded fonts and images (``[Fonts]`` and ``[Graphics]``) are
+                not kept in memory. Only their position in the file is remembered and they are
+                read when accessed, see :class:`LazyAttachmentDict`. This requires a seekable
+                input file which is still available when the attachments are accessed; otherwise,
+                attachments are read as usual.
+            skip_attachments: If True, embedded fonts and images are ignored altogether.
+                This overrides the ``lazy_attachments`` option.
+
+        .. versionchanged:: 1.9.0
+           Added the ``lazy_attachments`` and ``skip_attachments`` options.
+
+        """
+        if skip_attachments:
+            lazy_attachments = False
+
+        attachment_reader = _get_attachment_reader(fp) if lazy_attachments else None
+        if lazy_attachments and attachment_reader is None:
+            logging.debug("cannot seek in input file, attachments will be read eagerly")
+
+        # we need to use readline() instead of iterating over the file, since the latter disables tell()
+        lines: Iterable[str] = iter(fp.readline, "") if attachment_reader is not None else fp
+        yield from cls._parse_lines(subs, lines, format_, fp.tell, attachment_reader, skip_attachments)
 
-                return sign * timestamp_to_ms(m.groups())
-            elif "color" in f:
-                v = v.strip()
-                return rgba_to_color(v)
-            elif f in {"bold", "underline", "italic", "strikeout"}:
-                return v != "0"
-            elif f in {"borderstyle", "encoding", "marginl", "marginr", "marginv", "layer", "alphalevel"}:
-                try:
-                    return int(v)
-                except ValueError:
-                    warnings.warn(f"Failed to parse {f}, using default", RuntimeWarning)
-                    return 0
-            elif f in {"fontsize", "scalex", "scaley", "spacing", "angle", "outline", "shadow"}:
-                return float(v)
-            elif f == "marked":
-                return v.endswith("1")
-            elif f == "alignment":
-                try:
-                    if format_ == "ass":
-                        return Alignment(int(v))
-                    else:
-                        return Alignment.from_ssa_alignment(int(v))
-                except Exception:
-                    warnings.warn("Failed to parse alignment, using default", RuntimeWarning)
-                    return Alignment.BOTTOM_CENTER
-            elif f == "fontname":
-                return v.strip()
-            else:
-                return v
+    @classmethod
+    def from_buffer(cls, subs: "SSAFile", buffer: ByteBuffer, format_: str, encoding: str,
+                    errors: Optional[str] = None, lazy_attachments: bool = False,
+                    skip_attachments: bool = False, **kwargs: Any) -> None:
+        """
+        See :meth:`pysubs2.formats.FormatBase.from_buffer()`
+
+        Lines are decoded one by one, except for embedded fonts and images, which are skipped over
+        and then decoded in one go for each attachment (when accessed, with the ``lazy_attachments`` option;
+        or not at all, with the ``skip_attachments`` option, see :meth:`SubstationFormat.iter_events()`).
+        UTF-16 and other encodings which are not ASCII-compatible are handled by decoding the whole buffer.
+
+        .. versionadded:: 1.9.0
+
+        """
+        if not can_split_lines(buffer, encoding):
+            super().from_buffer(subs, buffer, format_, encoding, errors, lazy_attachments=lazy_attachments,
+                                skip_attachments=skip_attachments, **kwargs)
+            return
+
+        errors = errors or "strict"
+        lines = _BufferLines(buffer, encoding, errors, skip_attachment_data=True)
+        attachment_reader: Optional[Callable[[int], List[str]]] = None
+        if not skip_attachments:
+            def read_from_buffer(position: int) -> List[str]:
+                return _read_attachment_from_buffer(buffer, encoding, errors, position)
+
+            attachment_reader = read_from_buffer
+
+        subs.events.extend(cls._parse_lines(subs, lines, format_, lines.tell, attachment_reader, skip_attachments))
+
+        if not lazy_attachments:
+            # attachments were skipped while parsing, read them at once
+            subs.fonts_opaque = dict(subs.fonts_opaque)
+            subs.graphics_opaque = dict(subs.graphics_opaque)
+
+    @classmethod
+    def _parse_lines(cls, subs: "SSAFile", lines: Iterable[str], format_: str, tell: Callable[[], int],
+                     attachment_reader: Optional[Callable[[int], List[str]]],
+                     skip_attachments: bool) -> Iterator[SSAEvent]:
+        style_field_parsers = get_field_parsers(STYLE_FIELDS[format_], format_)
+        event_field_parsers = get_field_parsers(EVENT_FIELDS[format_], format_)
+        event_maxsplit = len(event_field_parsers) - 1
 
         subs.info.clear()
         subs.aegisub_project.clear()
         subs.styles.clear()
-        subs.fonts_opaque.clear()
-        subs.graphics_opaque.clear()
+        if attachment_reader is not None:
+            subs.fonts_opaque = LazyAttachmentDict(attachment_reader)
+            subs.graphics_opaque = LazyAttachmentDict(attachment_reader)
+        else:
+            subs.fonts_opaque.clear()
+            subs.graphics_opaque.clear()
 
         inside_info_section = False
         inside_aegisub_section = False
         inside_font_section = False
         inside_graphic_section = False
         current_attachment_name = None
-        current_attachment_lines_buffer = []
+        current_attachment_position = None
+        current_attachment_lines_buffer: List[str] = []
         current_attachment_is_font = None
 
-        for lineno, line in enumerate(fp, 1):
+        def flush_attachment(name: str, is_font: bool) -> None:
+            if skip_attachments:
+                return
+            attachments = subs.fonts_opaque if is_font else subs.graphics_opaque
+            if isinstance(attachments, LazyAttachmentDict) and current_attachment_position is not None:
+                attachments.set_position(name, current_attachment_position)
+            else:
+                attachments[name] = current_attachment_lines_buffer[:]
+
+        for lineno, line in enumerate(lines, 1):
             line = line.strip()
 
             if SECTION_HEADING.match(line):
@@ -281,13 +687,7 @@ class SubstationFormat(FormatBase):
 
                 if current_attachment_name and (m or not line):
                     # flush last font/picture on newline or new font/picture name
-                    attachment_data = current_attachment_lines_buffer[:]
-                    if inside_font_section:
-                        subs.fonts_opaque[current_attachment_name] = attachment_data
-                    elif inside_graphic_section:
-                        subs.graphics_opaque[current_attachment_name] = attachment_data
-                    else:
-                        raise NotImplementedError("Bad attachment section, expected [Fonts] or [Graphics]")
+                    flush_attachment(current_attachment_name, inside_font_section)
                     logging.debug("at line %d: finished attachment definition %s", lineno, current_attachment_name)
                     current_attachment_lines_buffer.clear()
                     current_attachment_name = None
@@ -296,34 +696,29 @@ class SubstationFormat(FormatBase):
                     # start new font/picture
                     attachment_name = m.group("name")
                     current_attachment_name = attachment_name
-                elif line:
+                    if attachment_reader is not None:
+                        current_attachment_position = tell()
+                elif line and attachment_reader is None and not skip_attachments:
                     # add non-empty line to current buffer
                     current_attachment_lines_buffer.append(line)
             elif line.startswith("Style:"):
                 _, rest = line.split(":", 1)
                 buf = rest.strip().split(",")
                 name, *raw_fields = buf
-                field_dict = {f: string_to_field(f, v) for f, v in zip(STYLE_FIELDS[format_], raw_fields)}
+                field_dict = {f: parse(v) for (f, parse), v in zip(style_field_parsers, raw_fields)}
                 sty = SSAStyle(**field_dict)
                 subs.styles[name] = sty
             elif line.startswith("Dialogue:") or line.startswith("Comment:"):
                 ev_type, rest = line.split(":", 1)
-                raw_fields = rest.strip().split(",", len(EVENT_FIELDS[format_])-1)
-                field_dict = {f: string_to_field(f, v) for f, v in zip(EVENT_FIELDS[format_], raw_fields)}
+                raw_fields = rest.strip().split(",", event_maxsplit)
+                field_dict = {f: parse(v) for (f, parse), v in zip(event_field_parsers, raw_fields)}
                 field_dict["type"] = ev_type
-                ev = SSAEvent(**field_dict)
-                subs.events.append(ev)
+                yield SSAEvent(**field_dict)
 
         # cleanup fonts/pictures
         if current_attachment_name:
             # flush last font on EOF or new section w/o newline
-            attachment_data = current_attachment_lines_buffer[:]
-
-            if current_attachment_is_font:
-                subs.fonts_opaque[current_attachment_name] = attachment_data
-            else:
-                subs.graphics_opaque[current_attachment_name] = attachment_data
-
+            flush_attachment(current_attachment_name, bool(current_attachment_is_font))
             logging.debug("at EOF: finished attachment definition %s", current_attachment_name)
             current_attachment_lines_buffer.clear()
             current_attachment_name = None
@@ -331,76 +726,115 @@ class SubstationFormat(FormatBase):
     @classmethod
     def to_file(cls, subs: "SSAFile", fp: TextIO, format_: str, header_notice: str = NOTICE, **kwargs: Any) -> None:
         """See :meth:`pysubs2.formats.FormatBase.to_file()`"""
-        print("[Script Info]", file=fp)
+        write_chunked(fp, cls._iter_output_lines(subs, format_, header_notice))
+
+    @classmethod
+    def _iter_output_lines(cls, subs: "SSAFile", format_: str, header_notice: str) -> Iterator[str]:
+        yield "[Script Info]\n"
         for line in header_notice.splitlines(False):
-            print(";", line, file=fp)
+            yield f"; {line}\n"
 
         subs.info["ScriptType"] = "v4.00+" if format_ == "ass" else "v4.00"
         for k, v in subs.info.items():
-            print(k, v, sep=": ", file=fp)
+            yield f"{k}: {v}\n"
 
         if subs.aegisub_project:
-            print("\n[Aegisub Project Garbage]", file=fp)
+            yield "\n[Aegisub Project Garbage]\n"
             for k, v in subs.aegisub_project.items():
-                print(k, v, sep=": ", file=fp)
+                yield f"{k}: {v}\n"
 
-        def field_to_string(f: str, v: Any, line: Union[SSAEvent, SSAStyle]) -> str:
-            if f in {"start", "end"}:
-                return cls.ms_to_timestamp(v)
-            elif f == "marked":
-                return f"Marked={v:d}"
-            elif f == "alignment":
-                if isinstance(v, Alignment):
-                    alignment = v
-                else:
-                    warnings.warn("The 'alignment' attribute of SSAStyle should be an Alignment instance, using plain int is deprecated", DeprecationWarning)
-                    alignment = Alignment(v)
-
-                if format_ == "ssa":
-                    return str(alignment.to_ssa_alignment())
-                else:
-                    return str(alignment.value)
-            elif isinstance(v, bool):
-                return "-1" if v else "0"
-            elif isinstance(v, int):
-                return str(v)
-            elif isinstance(v, float):
-                return str(int(v) if v.is_integer() else v)
-            elif isinstance(v, str):
-                return v
-            elif isinstance(v, Color):
-                if format_ == "ass":
-                    return color_to_ass_rgba(v)
-                else:
-                    return color_to_ssa_rgb(v)
-            else:
-                raise TypeError(f"Unexpected type when writing a SubStation field {f!r} for line {line!r}")
-
-        print("\n[V4+ Styles]" if format_ == "ass" else "\n[V4 Styles]", file=fp)
-        print(STYLE_FORMAT_LINE[format_], file=fp)
+        yield "\n[V4+ Styles]\n" if format_ == "ass" else "\n[V4 Styles]\n"
+        yield STYLE_FORMAT_LINE[format_] + "\n"
+        style_field_formatters = cls._get_field_formatters(STYLE_FIELDS[format_], format_)
         for name, sty in subs.styles.items():
-            fields = [field_to_string(f, getattr(sty, f), sty) for f in STYLE_FIELDS[format_]]
-            print(f"Style: {name}", *fields, sep=",", file=fp)
+            fields = ",".join([format_field(getattr(sty, f), sty) for f, format_field in style_field_formatters])
+            yield f"Style: {name},{fields}\n"
 
         if subs.fonts_opaque:
-            print("\n[Fonts]", file=fp)
+            yield "\n[Fonts]\n"
             for font_name, font_lines in sorted(subs.fonts_opaque.items()):
-                print(f"fontname: {font_name}", file=fp)
+                yield f"fontname: {font_name}\n"
                 for line in font_lines:
-                    print(line, file=fp)
-                print(file=fp)
+                    yield f"{line}\n"
+                yield "\n"
 
         if subs.graphics_opaque:
-            print("\n[Graphics]", file=fp)
+            yield "\n[Graphics]\n"
             for picture_name, picture_lines in sorted(subs.graphics_opaque.items()):
-                print(f"filename: {picture_name}", file=fp)
+                yield f"filename: {picture_name}\n"
                 for line in picture_lines:
-                    print(line, file=fp)
-                print(file=fp)
+                    yield f"{line}\n"
+                yield "\n"
 
-        print("\n[Events]", file=fp)
-        print(EVENT_FORMAT_LINE[format_], file=fp)
+        yield "\n[Events]\n"
+        yield EVENT_FORMAT_LINE[format_] + "\n"
+        event_field_formatters = cls._get_field_formatters(EVENT_FIELDS[format_], format_)
         for ev in subs.events:
-            fields = [field_to_string(f, getattr(ev, f), ev) for f in EVENT_FIELDS[format_]]
-            print(ev.type, end=": ", file=fp)
-            print(*fields, sep=",", file=fp)
+            fields = ",".join([format_field(getattr(ev, f), ev) for f, format_field in event_field_formatters])
+            yield f"{ev.type}: {fields}\n"
+
+    @classmethod
+    def _get_field_formatters(cls, fields: List[str], format_: str) -> List[Tuple[str, FieldFormatter]]:
+        """
+        Return list of (field name, formatter function) pairs for given fields.
+
+        Formatters are specialized for the expected type of each field and fall back to
+        :meth:`SubstationFormat._field_to_string()` for other value types.
+
+        """
+        def field_to_string(f: str) -> FieldFormatter:
+            return lambda v, line: cls._field_to_string(f, v, line, format_)
+
+        def make_formatter(f: str) -> FieldFormatter:
+            generic = field_to_string(f)
+            if f in {"start", "end"}:
+                ms_to_timestamp = cls.ms_to_timestamp
+                return lambda v, line: ms_to_timestamp(v)
+            elif f in {"marked", "alignment"}:
+                return generic
+            elif f in {"bold", "underline", "italic", "strikeout"}:
+                return lambda v, line: ("-1" if v else "0") if type(v) is bool else generic(v, line)
+            elif f in {"borderstyle", "encoding", "marginl", "marginr", "marginv", "layer", "alphalevel"}:
+                return lambda v, line: str(v) if type(v) is int else generic(v, line)
+            elif f in {"fontsize", "scalex", "scaley", "spacing", "angle", "outline", "shadow"}:
+                return lambda v, line: str(int(v) if v.is_integer() else v) if type(v) is float else generic(v, line)
+            elif "color" in f:
+                color_to_string = color_to_ass_rgba if format_ == "ass" else color_to_ssa_rgb
+                return lambda v, line: color_to_string(v) if type(v) is Color else generic(v, line)
+            else:
+                return lambda v, line: v if type(v) is str else generic(v, line)
+
+        return [(f, make_formatter(f)) for f in fields]
+
+    @classmethod
+    def _field_to_string(cls, f: str, v: Any, line: Union[SSAEvent, SSAStyle], format_: str) -> str:
+        if f in {"start", "end"}:
+            return cls.ms_to_timestamp(v)
+        elif f == "marked":
+            return f"Marked={v:d}"
+        elif f == "alignment":
+            if isinstance(v, Alignment):
+                alignment = v
+            else:
+                warnings.warn("The 'alignment' attribute of SSAStyle should be an Alignment instance, using plain int is deprecated", DeprecationWarning)
+                alignment = Alignment(v)
+
+            if format_ == "ssa":
+                return str(alignment.to_ssa_alignment())
+            else:
+                return str(alignment.value)
+        elif isinstance(v, bool):
+            return "-1" if v else "0"
+        elif isinstance(v, int):
+            return str(v)
+        elif isinstance(v, float):
+            return str(int(v) if v.is_integer() else v)
+        elif isinstance(v, str):
+            return v
+        elif isinstance(v, Color):
+            if format_ == "ass":
+                return color_to_ass_rgba(v)
+            else:
+                return color_to_ssa_rgb(v)
+        else:
+            raise TypeError(f"Unexpected type when writing a SubStation field {f!r} for line {line!r}")
@@ -6,7 +6,7 @@ from .base import FormatBase
 from ..ssaevent import SSAEvent
 from ..ssastyle import SSAStyle
 from .substation import parse_tags
-from ..time import ms_to_times, make_time, TIMESTAMP_SHORT, timestamp_to_ms
+from ..time import ms_to_times, memoize_timestamp_format, make_time, TIMESTAMP_SHORT, timestamp_to_ms
 from ..ssafile import SSAFile
 
 
@@ -17,6 +17,12 @@ TMP_LINE = re.compile(r"(\d{1,2}:\d{2}:\d{2}):(.+)")
 MAX_REPRESENTABLE_TIME = make_time(h=99, m=59, s=59)
 
 
+@memoize_timestamp_format
+def _format_timestamp(ms: int) -> str:
+    h, m, s, _ = ms_to_times(ms)
+    return f"{h:02d}:{m:02d}:{s:02d}"
+
+
 class TmpFormat(FormatBase):
     """TMP subtitle format implementation"""
 
@@ -28,8 +34,8 @@ class TmpFormat(FormatBase):
         if ms > MAX_REPRESENTABLE_TIME:
             warnings.warn("Overflow in TMP timestamp, clamping to MAX_REPRESENTABLE_TIME", RuntimeWarning)
             ms = MAX_REPRESENTABLE_TIME
-        h, m, s, _ = ms_to_times(ms)
-        return f"{h:02d}:{m:02d}:{s:02d}"
+        # only whole seconds are written, this improves cache hit rate
+        return _format_timestamp(int(round(ms)) // 1000 * 1000)
 
     @classmethod
     def guess_format(cls, text: str) -> Optional[str]:
@@ -1,19 +1,29 @@
+import functools
 import re
 from enum import Enum
-from typing import Optional, TextIO, Any, Dict, List, Union
+from typing import Optional, TextIO, Any, Dict, List, Union, Iterator
 import xml.etree.ElementTree as ET
 
 from .base import FormatBase
-from ..common import etree_iter_child_nodes, etree_register_namespace_override, etree_append_child_nodes
+from ..common import etree_append_child_nodes, write_chunked
 from ..ssaevent import SSAEvent
 from ..ssastyle import SSAStyle
 from .substation import parse_tags
-from ..time import ms_to_times, make_time
+from ..time import ms_to_times, make_time, memoize_timestamp_format
 from ..ssafile import SSAFile
 
 
 TT_NS = "{http://www.w3.org/ns/ttml}"
 TTS_NS = "{http://www.w3.org/ns/ttml#styling}"
+BR_TAG = f"{TT_NS}br"
+SPAN_TAG = f"{TT_NS}span"
+INDENT = "  "
+
+
+@memoize_timestamp_format
+def _format_timestamp(ms: int) -> str:
+    h, m, s, ms = ms_to_times(ms)
+    return f"{h:02d}:{m:02d}:{s:02d}.{ms:03d}"
 
 
 class TimeContainer(Enum):
@@ -29,8 +39,7 @@ class TTMLFormat(FormatBase):
         """Convert ms to 'HH:MM:SS.mmm'"""
         if ms < 0:
             ms = 0
-        h, m, s, ms = ms_to_times(ms)
-        return f"{h:02d}:{m:02d}:{s:02d}.{ms:03d}"
+        return _format_timestamp(ms)
 
     @staticmethod
     def timestamp_to_ms(expr: str) -> int:
@@ -66,37 +75,55 @@ class TTMLFormat(FormatBase):
         Frame-based time expressions are not supported.
 
         """
-        tree = ET.parse(fp)
-        root = tree.getroot()
+        subs.events.extend(cls.iter_events(subs, fp, format_, **kwargs))
 
-        body_elem = root.find(f"{TT_NS}body")
-        if body_elem is None:
-            return
+    @classmethod
+    def iter_events(cls, subs: "SSAFile", fp: TextIO, format_: str, **kwargs: Any) -> Iterator[SSAEvent]:
+        """
+        See :meth:`pysubs2.formats.FormatBase.iter_events()`
 
-        cls._parse_body(subs, body_elem)
+        The XML document is parsed incrementally. Each subtitle is yielded as soon as its ``<p>`` element
+        is closed and processed elements are discarded, so memory use does not grow with file size.
 
-    @classmethod
-    def _parse_body(cls, subs: "SSAFile", body_elem: ET.Element) -> None:
-        begin_ms = cls.timestamp_to_ms(body_elem.attrib.get("begin", "0s"))
-        time_container = TimeContainer(body_elem.attrib.get("timeContainer", "par"))
-        if time_container != TimeContainer.PAR:
-            raise NotImplementedError("Only 'par' timeContainer is supported")
+        .. versionadded:: 1.9.0
 
-        for div_elem in body_elem.iterfind(f"{TT_NS}div"):
-            cls._parse_div(subs, div_elem, begin_ms)
+        """
+        body_tag, div_tag, p_tag = f"{TT_NS}body", f"{TT_NS}div", f"{TT_NS}p"
+        path: List[ET.Element] = []  # currently open elements, starting with root
+        body_begin_ms = div_begin_ms = 0
+
+        for action, elem in ET.iterparse(fp, events=("start", "end")):
+            if action == "start":
+                path.append(elem)
+                depth = len(path)
+                if depth > 3:
+                    continue  # inside <p> or other element which is processed as a whole
+                elif depth == 2 and elem.tag == body_tag:
+                    body_begin_ms = cls._get_begin_ms(elem, 0)
+                elif depth == 3 and elem.tag == div_tag and path[1].tag == body_tag:
+                    div_begin_ms = cls._get_begin_ms(elem, body_begin_ms)
+            else:
+                path.pop()
+                depth = len(path)
+                if depth > 3:
+                    continue
+                elif depth == 3 and elem.tag == p_tag and path[2].tag == div_tag and path[1].tag == body_tag:
+                    yield cls._parse_p(elem, div_begin_ms)
+
+                # only <p> content is needed after its end tag, drop everything else above it
+                if depth >= 1:
+                    path[-1].remove(elem)
 
     @classmethod
-    def _parse_div(cls, subs: "SSAFile", div_elem: ET.Element, parent_begin_ms: int) -> None:
-        begin_ms = cls.timestamp_to_ms(div_elem.attrib.get("begin", "0s")) + parent_begin_ms
-        time_container = TimeContainer(div_elem.attrib.get("timeContainer", "par"))
+    def _get_begin_ms(cls, elem: ET.Element, parent_begin_ms: int) -> int:
+        begin_ms = cls.timestamp_to_ms(elem.attrib.get("begin", "0s")) + parent_begin_ms
+        time_container = TimeContainer(elem.attrib.get("timeContainer", "par"))
         if time_container != TimeContainer.PAR:
             raise NotImplementedError("Only 'par' timeContainer is supported")
-
-        for p_elem in div_elem.iterfind(f"{TT_NS}p"):
-            cls._parse_p(subs, p_elem, begin_ms)
+        return begin_ms
 
     @classmethod
-    def _parse_p(cls, subs: "SSAFile", p_elem: ET.Element, parent_begin_ms: int) -> None:
+    def _parse_p(cls, p_elem: ET.Element, parent_begin_ms: int) -> SSAEvent:
         begin_ms = cls.timestamp_to_ms(p_elem.attrib.get("begin", "0s")) + parent_begin_ms
         if "duration" in p_elem.attrib:
             end_ms = begin_ms + cls.timestamp_to_ms(p_elem.attrib["duration"])
@@ -106,31 +133,26 @@ class TTMLFormat(FormatBase):
         if time_container != TimeContainer.PAR:
             raise NotImplementedError("Only 'par' timeContainer is supported")
 
-        event = SSAEvent(start=begin_ms, end=end_ms)
-        subs.events.append(event)
-
-        for node in etree_iter_child_nodes(p_elem):
-            if isinstance(node, str):
-                event.text += node.strip().replace("\n", " ")
-            else:
-                if node.tag == f"{TT_NS}br":
-                    event.text += "\\N"
-                elif node.tag == f"{TT_NS}span":
-                    cls._parse_span(event, node)
+        fragments: List[str] = []
+        cls._collect_text(fragments, p_elem)
+        return SSAEvent(start=begin_ms, end=end_ms, text="".join(fragments))
 
     @classmethod
-    def _parse_span(cls, event: SSAEvent, span_elem: ET.Element) -> None:
-        for node in etree_iter_child_nodes(span_elem):
-            if isinstance(node, str):
-                event.text += node.strip().replace("\n", " ")
-            else:
-                if node.tag == f"{TT_NS}br":
-                    event.text += "\\N"
-                elif node.tag == f"{TT_NS}span":
-                    cls._parse_span(event, node)
+    def _collect_text(cls, fragments: List[str], elem: ET.Element) -> None:
+        # text is collected into a list and joined once, repeated += on event.text would be quadratic;
+        # this is etree_iter_child_nodes() inlined, as it is called for every span
+        if elem.text:
+            fragments.append(elem.text.strip().replace("\n", " "))
+        for child in elem:
+            if child.tag == BR_TAG:
+                fragments.append("\\N")
+            elif child.tag == SPAN_TAG:
+                cls._collect_text(fragments, child)
+            if child.tail:
+                fragments.append(child.tail.strip().replace("\n", " "))
 
     @classmethod
-    def to_file(cls, subs: "SSAFile", fp: TextIO, format_: str, **kwargs: Any) -> None:
+    def to_file(cls, subs: "SSAFile", fp: TextIO, format_: str, pretty_print: bool = True, **kwargs: Any) -> None:
         """
         TTML writer. Has partial support for styles and override tags.
 
@@ -141,52 +163,92 @@ class TTMLFormat(FormatBase):
             - primary color
             - underline
             - strikeout
+
+        The document is written incrementally, one subtitle at a time.
+
+        Keyword args:
+            pretty_print: If False, the XML is written without indentation and newlines.
+
+        .. versionchanged:: 1.9.0
+           Added ``pretty_print`` option.
+
         """
+        write_chunked(fp, cls._iter_output_xml(subs, pretty_print))
 
-        tt_elem = ET.Element(f"{TT_NS}tt")
-        head_elem = ET.SubElement(tt_elem, f"{TT_NS}head")
-        body_elem = ET.SubElement(tt_elem, f"{TT_NS}body")
-        div_elem = ET.SubElement(body_elem, f"{TT_NS}div")
-        styling_elem = ET.SubElement(head_elem, f"{TT_NS}styling")
+    @classmethod
+    def _iter_output_xml(cls, subs: "SSAFile", pretty_print: bool) -> Iterator[str]:
+        # Equivalent to building the whole <tt> element and serializing it after ET.indent(),
+        # except the tts namespace is always declared.
+        def newline(level: int) -> str:
+            return "\n" + level * INDENT if pretty_print else ""
+
+        yield f'<tt xmlns="{TT_NS[1:-1]}" xmlns:tts="{TTS_NS[1:-1]}">'
+        yield newline(1) + "<head>"
+
+        if subs.styles:
+            yield newline(2) + "<styling>"
+            for name, style in subs.styles.items():
+                attrs = {
+                    "id": name,
+                    **cls.ssastyle_to_tts(style),
+                }
+                output = [newline(3)]
+                _serialize_xml(ET.Element(f"{TT_NS}style", attrs), output)
+                yield "".join(output)
+            yield newline(2) + "</styling>"
+        else:
+            yield newline(2) + "<styling />"
 
-        for name, style in subs.styles.items():
-            attrs = {
-                "id": name,
-                **cls.ssastyle_to_tts(style),
-            }
-            ET.SubElement(styling_elem, f"{TT_NS}style", attrs)
+        yield newline(1) + "</head>"
+        yield newline(1) + "<body>"
 
+        has_events = False
         for event in subs.get_text_events():
-            event_style = subs.styles.get(event.style, SSAStyle.DEFAULT_STYLE)
-            attrs = {
-                "begin": str(cls.ms_to_timestamp(event.start)),
-                "end": str(cls.ms_to_timestamp(event.end)),
-                "style": event.style,
-            }
-            p_elem = ET.SubElement(div_elem, f"{TT_NS}p", attrs)
-
-            runs = parse_tags(event.text, event_style, subs.styles, skip_empty_fragments=True)
-
-            if len(runs) == 1:
-                fragment, sty = runs[0]
-                p_elem.attrib.update(cls.ssastyle_to_tts(sty, event_style))
-                cls._append_text(p_elem, fragment)
-            else:
-                for fragment, sty in runs:
-                    attrs = cls.ssastyle_to_tts(sty, event_style)
-                    if attrs:
-                        span_elem = ET.SubElement(p_elem, f"{TT_NS}span", attrs)
-                        cls._append_text(span_elem, fragment)
-                    else:
-                        cls._append_text(p_elem, fragment)
-
-        with etree_register_namespace_override():
-            ET.register_namespace("", "http://www.w3.org/ns/ttml")
-            ET.register_namespace("ttm", "http://www.w3.org/ns/ttml#metadata")
-            ET.register_namespace("tts", "http://www.w3.org/ns/ttml#styling")
-            ET.indent(tt_elem)
-            output_xml = ET.tostring(tt_elem).decode("utf-8")
-            print(output_xml, file=fp)
+            if not has_events:
+                yield newline(2) + "<div>"
+                has_events = True
+
+            p_elem = cls._make_p_element(subs, event)
+            if pretty_print:
+                ET.indent(p_elem, INDENT, level=3)
+            output = [newline(3)]
+            _serialize_xml(p_elem, output)
+            yield "".join(output)
+
+        if has_events:
+            yield newline(2) + "</div>"
+        else:
+            yield newline(2) + "<div />"
+
+        yield newline(1) + "</body>"
+        yield newline(0) + "</tt>\n"
+
+    @classmethod
+    def _make_p_element(cls, subs: "SSAFile", event: SSAEvent) -> ET.Element:
+        event_style = subs.styles.get(event.style, SSAStyle.DEFAULT_STYLE)
+        attrs = {
+            "begin": str(cls.ms_to_timestamp(event.start)),
+            "end": str(cls.ms_to_timestamp(event.end)),
+            "style": event.style,
+        }
+        p_elem = ET.Element(f"{TT_NS}p", attrs)
+
+        runs = parse_tags(event.text, event_style, subs.styles, skip_empty_fragments=True)
+
+        if len(runs) == 1:
+            fragment, sty = runs[0]
+            p_elem.attrib.update(cls.ssastyle_to_tts(sty, event_style))
+            cls._append_text(p_elem, fragment)
+        else:
+            for fragment, sty in runs:
+                attrs = cls.ssastyle_to_tts(sty, event_style)
+                if attrs:
+                    span_elem = ET.SubElement(p_elem, f"{TT_NS}span", attrs)
+                    cls._append_text(span_elem, fragment)
+                else:
+                    cls._append_text(p_elem, fragment)
+
+        return p_elem
 
     @classmethod
     def ssastyle_to_tts(cls, style: SSAStyle, base_style: Optional[SSAStyle] = None) -> Dict[str, str]:
@@ -232,3 +294,59 @@ class TTMLFormat(FormatBase):
             nodes.append(chunk)
 
         etree_append_child_nodes(elem, nodes)
+
+
+def _serialize_xml(elem: ET.Element, output: List[str]) -> None:
+    """
+    Serialize element like ``ET.tostring()``, using the prefixes declared on ``<tt>`` element
+
+    Unlike ``ET.tostring()``, this does not repeat namespace declarations on each serialized subtree.
+
+    """
+    tag = _qname(elem.tag)
+    output.append(f"<{tag}")
+    for key, value in elem.attrib.items():
+        output.append(f' {_qname(key)}="{_escape_attrib(value)}"')
+    if elem.text or len(elem):
+        output.append(">")
+        if elem.text:
+            output.append(_escape_text(elem.text))
+        for child in elem:
+            _serialize_xml(child, output)
+            if child.tail:
+                output.append(_escape_text(child.tail))
+        output.append(f"</{tag}>")
+    else:
+        output.append(" />")
+
+
+@functools.lru_cache(maxsize=None)
+def _qname(name: str) -> str:
+    if name.startswith(TT_NS):
+        return name[len(TT_NS):]
+    elif name.startswith(TTS_NS):
+        return "tts:" + name[len(TTS_NS):]
+    elif name.startswith("{"):
+        raise ValueError(f"Unexpected XML namespace in {name!r}")
+    return name
+
+
+def _escape_text(text: str) -> str:
+    if "&" in text:
+        text = text.replace("&", "&amp;")
+    if "<" in text:
+        text = text.replace("<", "&lt;")
+    if ">" in text:
+        text = text.replace(">", "&gt;")
+    if not text.isascii():
+        # like ET.tostring(), which writes US-ASCII, so that the output is valid in any encoding
+        text = text.encode("ascii", "xmlcharrefreplace").decode("ascii")
+    return text
+
+
+def _escape_attrib(text: str) -> str:
+    text = _escape_text(text)
+    for char, entity in (("\"", "&quot;"), ("\r", "&#13;"), ("\n", "&#10;"), ("\t", "&#09;")):
+        if char in text:
+            text = text.replace(char, entity)
+    return text
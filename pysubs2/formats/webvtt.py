@@ -1,5 +1,6 @@
 import re
-from typing import List, Sequence, Optional, TextIO, Any
+from operator import attrgetter
+from typing import Sequence, Optional, TextIO, Any, Iterator
 
 from ..ssaevent import SSAEvent
 from .subrip import SubripFormat
@@ -43,12 +44,13 @@ class WebVTTFormat(SubripFormat):
         """
         See :meth:`pysubs2.formats.SubripFormat.to_file()`, additional SRT options are supported by VTT as well
         """
-        print("WEBVTT\n", file=fp)
+        fp.write("WEBVTT\n\n")
         return super(WebVTTFormat, cls).to_file(
             subs=subs, fp=fp, format_=format_, **kwargs)
 
     @classmethod
-    def _get_visible_lines(cls, subs: "SSAFile") -> List[SSAEvent]:
-        visible_lines = super()._get_visible_lines(subs)
-        visible_lines.sort(key=lambda e: e.start)
-        return visible_lines
+    def _iter_visible_lines(cls, subs: "SSAFile") -> Iterator[SSAEvent]:
+        visible_lines = super()._iter_visible_lines(subs)
+        if subs.is_sorted():
+            return visible_lines  # already in time order, no need to sort a copy
+        return iter(sorted(visible_lines, key=attrgetter("start")))
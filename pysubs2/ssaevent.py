@@ -1,12 +1,13 @@
 import re
 import warnings
-from typing import Optional, Dict, Any, ClassVar, FrozenSet
+from typing import Optional, Dict, Any, ClassVar, FrozenSet, Tuple
 import dataclasses
 
-from .common import IntOrFloat
+from .common import IntOrFloat, dataclass_add_slots, dataclass_field_values, canonical_field_values, stable_hash
 from .time import ms_to_str, make_time
 
 
+@dataclass_add_slots(extra_slots=("_plaintext_cache", "_is_drawing_cache"))
 @dataclasses.dataclass(repr=False, eq=False, order=False)
 class SSAEvent:
     """
@@ -18,6 +19,9 @@ class SSAEvent:
 
     This class defines an ordering with respect to (start, end) timestamps.
 
+    To save memory, the class uses ``__slots__``, so it's not possible to set attributes
+    other than the fields listed below.
+
     .. tip :: Use :func:`pysubs2.make_time()` to get times in milliseconds.
 
     Example::
@@ -26,6 +30,7 @@ class SSAEvent:
 
     """
     OVERRIDE_SEQUENCE: ClassVar = re.compile(r"{[^}]*}")
+    DRAWING_TAG: ClassVar = re.compile(r"\\p[1-9]")  # text without this is never a drawing
 
     start: int = 0  #: Subtitle start time (in milliseconds)
     end: int = 10000  #: Subtitle end time (in milliseconds)
@@ -40,6 +45,12 @@ class SSAEvent:
     effect: str = ""  #: Line effect
     type: str = "Dialogue"  #: Line type (Dialogue/Comment)
 
+    def __post_init__(self) -> None:
+        # private caches in extra slots, not dataclass fields;
+        # (text, value) pairs which are valid while self.text is the same object
+        self._plaintext_cache: Optional[Tuple[str, str]] = None
+        self._is_drawing_cache: Optional[Tuple[str, bool]] = None
+
     @property
     def FIELDS(self) -> FrozenSet[str]:
         """All fields in SSAEvent."""
@@ -82,9 +93,25 @@ class SSAEvent:
 
     @property
     def is_drawing(self) -> bool:
-        """Returns True if line is SSA drawing tag (ie. not text)"""
-        from .formats.substation import parse_tags
-        return any(sty.drawing for _, sty in parse_tags(self.text))
+        """
+        Returns True if line is SSA drawing tag (ie. not text)
+
+        .. versionchanged:: 1.9.0
+            The value is cached until :attr:`SSAEvent.text` is changed.
+
+        """
+        text = self.text
+        cache = self._is_drawing_cache
+        if cache is not None and cache[0] is text:
+            return cache[1]
+
+        if self.DRAWING_TAG.search(text) is None:
+            value = False  # fast path, eg. for "\pos" tags
+        else:
+            from .formats.substation import _has_drawing
+            value = _has_drawing(text)
+        self._is_drawing_cache = (text, value)
+        return value
 
     @property
     def is_text(self) -> bool:
@@ -102,13 +129,22 @@ class SSAEvent:
 
         Writing to this property replaces :attr:`SSAEvent.text` with given plain
         text. Newlines are converted to ``\\N`` tags.
+
+        .. versionchanged:: 1.9.0
+            The value is cached until :attr:`SSAEvent.text` is changed.
+
         """
         text = self.text
-        text = self.OVERRIDE_SEQUENCE.sub("", text)
-        text = text.replace(r"\h", " ")
-        text = text.replace(r"\n", "\n")
-        text = text.replace(r"\N", "\n")
-        return text
+        cache = self._plaintext_cache
+        if cache is not None and cache[0] is text:
+            return cache[1]
+
+        value = self.OVERRIDE_SEQUENCE.sub("", text)
+        value = value.replace(r"\h", " ")
+        value = value.replace(r"\n", "\n")
+        value = value.replace(r"\N", "\n")
+        self._plaintext_cache = (text, value)
+        return value
 
     @plaintext.setter
     def plaintext(self, text: str) -> None:
@@ -137,10 +173,22 @@ class SSAEvent:
     def equals(self, other: "SSAEvent") -> bool:
         """Field-based equality for SSAEvents."""
         if isinstance(other, SSAEvent):
-            return self.as_dict() == other.as_dict()
+            return dataclass_field_values(self) == dataclass_field_values(other)
         else:
             raise TypeError("Cannot compare to non-SSAEvent object")
 
+    def fingerprint(self) -> int:
+        """
+        Hash of all fields, see :meth:`SSAEvent.equals()`.
+
+        Events which are equal have the same fingerprint. Unlike builtin ``hash()``, the value
+        is stable, so it can be stored and compared across Python processes and versions of Python.
+
+        .. versionadded:: 1.9.0
+
+        """
+        return stable_hash([canonical_field_values(self)])
+
     def __eq__(self, other: object) -> bool:
         # XXX document this
         if not isinstance(other, SSAEvent):
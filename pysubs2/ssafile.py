@@ -1,13 +1,24 @@
+import codecs
+import dataclasses
 import io
-from itertools import chain
+import mmap
+from itertools import chain, islice
+import operator
+from operator import attrgetter
 import os.path
 import logging
-from typing import Optional, List, Dict, Iterable, Any, overload, Iterator, TextIO, Tuple, MutableSequence
+from typing import Optional, List, Dict, Iterable, Any, overload, Iterator, TextIO, Tuple, MutableSequence, MutableMapping, Sequence, \
+    Callable, Set, Mapping, AbstractSet
 
-from .common import IntOrFloat
+from .common import IntOrFloat, ByteBuffer, peek_text, detect_encoding, DEFAULT_ENCODING_CANDIDATES, \
+    ENCODING_DETECTION_PREFIX_SIZE, dataclass_field_values, canonical_field_values, stable_hash
 from .ssaevent import SSAEvent
 from .ssastyle import SSAStyle
 from .time import make_time, ms_to_str
+from .timings import EventTimings, IntervalIndex
+
+#: Number of characters at the beginning of file used to autodetect subtitle format.
+FORMAT_DETECTION_PREFIX_SIZE = 10000
 
 
 class SSAFile(MutableSequence[SSAEvent]):
@@ -39,10 +50,11 @@ class SSAFile(MutableSequence[SSAEvent]):
         self.styles: Dict[str, SSAStyle] = {"Default": SSAStyle.DEFAULT_STYLE.copy()}  #: Dict of :class:`SSAStyle` instances.
         self.info: Dict[str, str] = self.DEFAULT_INFO.copy()  #: Dict with script metadata, ie. ``[Script Info]``.
         self.aegisub_project: Dict[str, str] = {}  #: Dict with Aegisub project, ie. ``[Aegisub Project Garbage]``.
-        self.fonts_opaque: Dict[str, Any] = {}  #: Dict with embedded fonts, ie. ``[Fonts]``.
-        self.graphics_opaque: Dict[str, Any] = {}  #: Dict with embedded images, ie. ``[Graphics]``.
+        self.fonts_opaque: MutableMapping[str, Any] = {}  #: Dict with embedded fonts, ie. ``[Fonts]``.
+        self.graphics_opaque: MutableMapping[str, Any] = {}  #: Dict with embedded images, ie. ``[Graphics]``.
         self.fps: Optional[float] = None  #: Framerate used when reading the file, if applicable.
         self.format: Optional[str] = None  #: Format of source subtitle file, if applicable, eg. ``"srt"``.
+        self._interval_index: Optional[Tuple[List[SSAEvent], IntervalIndex]] = None
 
     # ------------------------------------------------------------------------
     # I/O methods
@@ -50,7 +62,7 @@ class SSAFile(MutableSequence[SSAEvent]):
 
     @classmethod
     def load(cls, path: str, encoding: str = "utf-8", format_: Optional[str] = None, fps: Optional[float] = None,
-             errors: Optional[str] = None, **kwargs: Any) -> "SSAFile":
+             errors: Optional[str] = None, use_mmap: bool = False, **kwargs: Any) -> "SSAFile":
         """
         Load subtitle file from given path.
 
@@ -64,7 +76,13 @@ class SSAFile(MutableSequence[SSAEvent]):
         Arguments:
             path (str): Path to subtitle file.
             encoding (str): Character encoding of input file.
-                Defaults to UTF-8, you may need to change this.
+                Defaults to UTF-8, you may need to change this. Use ``"auto"``
+                to detect the encoding, see :meth:`SSAFile.from_bytes()` (which also describes
+                the related ``encoding_candidates`` option).
+
+                .. versionchanged:: 1.9.0
+                    Added the ``"auto"`` option.
+
             errors (Optional[str]): Error handling for character encoding
                 of input file. Defaults to ``None``; use the value ``"surrogateescape"``
                 for pass-through of bytes not supported by selected encoding via
@@ -85,6 +103,15 @@ class SSAFile(MutableSequence[SSAEvent]):
                 be detected from the file, in which case you don't need
                 to specify it here (when given, this argument overrides
                 autodetection).
+            use_mmap (bool): If True, the file is memory-mapped and parsed with :meth:`SSAFile.from_bytes()`
+                instead of being read in text mode. This is meant for very large files: the SubStation
+                parser then skips over embedded fonts and images in the binary data instead of decoding
+                them line by line. Use it together with the ``lazy_attachments`` option to only
+                decode attachments when they are accessed; the mapping is then kept open until
+                :meth:`pysubs2.formats.substation.LazyAttachmentDict.close()` is called.
+
+                .. versionadded:: 1.9.0
+
             kwargs: Extra options for the reader.
 
         Returns:
@@ -106,11 +133,146 @@ class SSAFile(MutableSequence[SSAEvent]):
             >>> subs1 = pysubs2.load("subrip-subtitles.srt")
             >>> subs2 = pysubs2.load("microdvd-subtitles.sub",fps=23.976)
             >>> subs3 = pysubs2.load("subrip-subtitles-with-fancy-tags.srt",keep_unknown_html_tags=True)
+            >>> subs4 = pysubs2.load("subtitles-in-unknown-encoding.srt", encoding="auto")
 
         """
+        if use_mmap:
+            with open(path, "rb") as binary_fp:
+                if os.fstat(binary_fp.fileno()).st_size == 0:
+                    return cls.from_bytes(b"", encoding, format_, fps=fps, errors=errors, **kwargs)
+                buffer = mmap.mmap(binary_fp.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                subs = cls.from_bytes(buffer, encoding, format_, fps=fps, errors=errors, **kwargs)
+            except BaseException:
+                buffer.close()
+                raise
+
+            lazy_attachments = [attachments for attachments in (subs.fonts_opaque, subs.graphics_opaque)
+                                if isinstance(attachments, LazyAttachmentDict)]
+            if lazy_attachments:
+                # attachments are read from the mapping when accessed, it is closed by LazyAttachmentDict.close()
+                for attachments in lazy_attachments:
+                    attachments.add_close_callback(buffer.close)
+            else:
+                buffer.close()
+            return subs
+
+        if encoding == "auto":
+            with open(path, "rb") as fp:
+                data = fp.read()
+            return cls.from_bytes(data, encoding, format_, fps=fps, errors=errors, **kwargs)
+
         with open(path, encoding=encoding, errors=errors) as fp:
             return cls.from_file(fp, format_, fps=fps, **kwargs)
 
+    @classmethod
+    def iter_events(cls, path: str, encoding: str = "utf-8", format_: Optional[str] = None,
+                    fps: Optional[float] = None, errors: Optional[str] = None, header: Optional["SSAFile"] = None,
+                    **kwargs: Any) -> Iterator[SSAEvent]:
+        """
+        Read subtitles from given path one by one, without loading the whole file into memory.
+
+        This is useful for scanning very large files, since events are parsed lazily
+        and are not stored anywhere. This is truly streaming for SubStation (ASS, SSA),
+        SubRip, WebVTT and TTML files. For other formats (MicroDVD, MPL2, TMP, SAMI, JSON
+        and Whisper), the whole file is read and the events are then yielded from memory.
+
+        Arguments:
+            path (str): Path to subtitle file.
+            header (Optional[SSAFile]): When given, it should be an empty :class:`SSAFile`.
+                Everything except events (ie. info, styles, etc.) will be read into it.
+                For SubStation, sections preceding ``[Events]`` are already parsed
+                when the first event is yielded.
+            encoding, format_, fps, errors, kwargs: See :meth:`SSAFile.load()`.
+
+        Returns:
+            Iterator of :class:`SSAEvent`
+
+        Example:
+            >>> header = SSAFile()
+            >>> for line in pysubs2.iter_events("karaoke.ass", header=header):
+            ...     if line.style == "Romaji":
+            ...         print(line.text)
+
+        .. versionadded:: 1.9.0
+
+        """
+        subs = header if header is not None else cls()
+        if encoding == "auto":
+            with open(path, "rb") as binary_fp:
+                # one extra byte tells detect_encoding() that there is more data
+                encoding = detect_encoding(binary_fp.read(ENCODING_DETECTION_PREFIX_SIZE + 1),
+                                           kwargs.pop("encoding_candidates", DEFAULT_ENCODING_CANDIDATES))
+
+        with open(path, encoding=encoding, errors=errors) as fp:
+            if format_ is None:
+                fragment, text_fp = peek_text(fp, FORMAT_DETECTION_PREFIX_SIZE)
+                format_ = autodetect_format(fragment)
+            else:
+                text_fp = fp
+
+            impl = get_format_class(format_)
+            subs.format = format_
+            subs.fps = fps
+            yield from impl.iter_events(subs, text_fp, format_, fps=fps, **kwargs)
+
+    @classmethod
+    def from_bytes(cls, data: ByteBuffer, encoding: str = "auto", format_: Optional[str] = None,
+                   fps: Optional[float] = None, errors: Optional[str] = None,
+                   encoding_candidates: Sequence[str] = DEFAULT_ENCODING_CANDIDATES, **kwargs: Any) -> "SSAFile":
+        """
+        Load subtitle file from bytes.
+
+        See :meth:`SSAFile.load()` for full description. Newlines are handled the same way
+        as when reading a file in text mode. Parsing is implemented by :meth:`pysubs2.formats.FormatBase.from_buffer()`,
+        SubStation and SubRip parsers find subtitles in the binary data and decode them one by one.
+
+        Arguments:
+            data (bytes): Subtitle file in binary form, or other buffer like ``bytearray``
+                or :class:`mmap.mmap`.
+            encoding (str): Character encoding of the data. By default, it is detected:
+                when the data starts with a byte order mark, the corresponding Unicode
+                encoding is used, otherwise the first of ``encoding_candidates`` which
+                can decode the beginning of data is used (see :func:`pysubs2.common.detect_encoding()`).
+            encoding_candidates: Encodings to try when ``encoding`` is ``"auto"``,
+                defaults to UTF-8 and Windows-1252. Single-byte encodings accept
+                almost any data, so they should come last, eg. ``["utf-8", "cp1250"]``
+                for Central European subtitles.
+            errors (Optional[str]): Error handling for character encoding,
+                see :meth:`SSAFile.load()`. It applies to decoding the data with the given
+                or detected encoding. Encoding detection itself ignores it: candidates are
+                checked strictly on the beginning of data only, and when none of them fits,
+                the first one is used. With the default strict handling, data which cannot
+                be decoded (including data after the checked beginning) raises ``UnicodeDecodeError``.
+
+        Returns:
+            SSAFile
+
+        Example:
+            >>> with open("subtitles.srt", "rb") as fp:
+            ...     data = fp.read()
+            >>> subs = SSAFile.from_bytes(data, encoding_candidates=["utf-8", "cp1250"])
+
+        .. versionadded:: 1.9.0
+
+        """
+        if encoding == "auto":
+            encoding = detect_encoding(data, encoding_candidates)
+            logging.debug("detected encoding %s", encoding)
+
+        if format_ is None:
+            # Autodetect subtitle format from the beginning of data, the rest is decoded by the parser.
+            decoder = codecs.getincrementaldecoder(encoding)(errors or "strict")
+            fragment = decoder.decode(data[:FORMAT_DETECTION_PREFIX_SIZE * 4])
+            format_ = autodetect_format(fragment[:FORMAT_DETECTION_PREFIX_SIZE])
+
+        impl = get_format_class(format_)
+        subs = cls()  # an empty subtitle file
+        subs.format = format_
+        subs.fps = fps
+        impl.from_buffer(subs, data, format_, encoding, errors, fps=fps, **kwargs)
+        return subs
+
     @classmethod
     def from_string(cls, string: str, format_: Optional[str] = None, fps: Optional[float] = None,
                     **kwargs: Any) -> "SSAFile":
@@ -176,13 +338,10 @@ class SSAFile(MutableSequence[SSAEvent]):
 
         """
         if format_ is None:
-            # Autodetect subtitle format, then read again using correct parser.
-            # The file might be a pipe and we need to read it twice,
-            # so just buffer everything.
-            text = fp.read()
-            fragment = text[:10000]
+            # Autodetect subtitle format from the beginning of file, then read it using correct parser.
+            # When the file is not seekable (eg. a pipe), only the beginning is buffered.
+            fragment, fp = peek_text(fp, FORMAT_DETECTION_PREFIX_SIZE)
             format_ = autodetect_format(fragment)
-            fp = io.StringIO(text)
 
         impl = get_format_class(format_)
         subs = cls() # an empty subtitle file
@@ -284,7 +443,8 @@ class SSAFile(MutableSequence[SSAEvent]):
     # ------------------------------------------------------------------------
 
     def shift(self, h: IntOrFloat = 0, m: IntOrFloat = 0, s: IntOrFloat = 0, ms: IntOrFloat = 0,
-              frames: Optional[int] = None, fps: Optional[float] = None) -> None:
+              frames: Optional[int] = None, fps: Optional[float] = None,
+              selection: Optional[Iterable[int]] = None) -> None:
         """
         Shift all subtitles by constant time amount.
 
@@ -299,17 +459,26 @@ class SSAFile(MutableSequence[SSAEvent]):
             frames (int): When specified, must be an integer number of frames.
                 May be positive or negative. fps must be also specified.
             fps (float): When specified, must be a positive number.
+            selection: Indices of subtitles to shift (eg. from :meth:`SSAFile.select()`),
+                other subtitles are left as they are. Duplicate indices are ignored.
+                By default, all subtitles are shifted.
+
+                .. versionadded:: 1.9.0
 
         Raises:
             ValueError: Invalid fps or missing number of frames.
 
+        Example:
+            >>> subs.shift(s=-1.5, selection=subs.select(style="Signs"))
+
         """
         delta = make_time(h=h, m=m, s=s, ms=ms, frames=frames, fps=fps)
-        for line in self:
+        for line in self._get_selected_events(selection):
             line.start += delta
             line.end += delta
+        self.invalidate_caches()
 
-    def transform_framerate(self, in_fps: float, out_fps: float) -> None:
+    def transform_framerate(self, in_fps: float, out_fps: float, selection: Optional[Iterable[int]] = None) -> None:
         """
         Rescale all timestamps by ratio of in_fps/out_fps.
 
@@ -319,6 +488,9 @@ class SSAFile(MutableSequence[SSAEvent]):
         Arguments:
             in_fps (float)
             out_fps (float)
+            selection: Indices of subtitles to change, see :meth:`SSAFile.shift()`.
+
+                .. versionadded:: 1.9.0
 
         Raises:
             ValueError: Non-positive framerate given.
@@ -328,9 +500,150 @@ class SSAFile(MutableSequence[SSAEvent]):
             raise ValueError(f"Framerates must be positive, cannot transform {in_fps} -> {out_fps}")
 
         ratio = in_fps / out_fps
-        for line in self:
+        for line in self._get_selected_events(selection):
             line.start = int(round(line.start * ratio))
             line.end = int(round(line.end * ratio))
+        self.invalidate_caches()
+
+    def retime(self, anchors: Sequence[Tuple[int, int]], selection: Optional[Iterable[int]] = None) -> int:
+        """
+        Retime subtitles by piecewise-linear mapping given by anchor points.
+
+        This is useful for fixing gradual drift, eg. when anchors come from audio synchronization.
+        Each anchor ``(old time, new time)`` is mapped exactly, times between anchors are interpolated
+        linearly and times before the first (after the last) anchor are extrapolated using the first (last)
+        pair of anchors. See :meth:`pysubs2.timings.EventTimings.map_piecewise()`, which does the work
+        in a single pass over subtitles and anchors.
+
+        Arguments:
+            anchors: Pairs of ``(old time, new time)`` in milliseconds, sorted by old time.
+            selection: Indices of subtitles to retime, see :meth:`SSAFile.shift()`.
+
+        Returns:
+            Number of subtitles whose start or end time was changed.
+
+        Raises:
+            ValueError: No anchors given, or old times are not strictly increasing.
+
+        Example:
+            >>> # subtitles are in sync at the start, 1.2 seconds late at 30 minutes and 2.5 seconds late at the end
+            >>> subs.retime([(0, 0), (make_time(m=30), make_time(m=30, s=-1.2)), (make_time(h=1), make_time(h=1, s=-2.5))])
+
+        .. versionadded:: 1.9.0
+
+        """
+        events = self._get_selected_events(selection)
+        timings = EventTimings.from_events(events)
+        timings.map_piecewise(anchors)
+        moved = timings.apply(events)
+        self.invalidate_caches()
+        return moved
+
+    def select(self, style: Optional[str] = None, layer: Optional[int] = None,
+               time_range: Optional[Tuple[int, int]] = None, indices: Optional[Iterable[int]] = None,
+               predicate: Optional[Callable[[SSAEvent], bool]] = None) -> List[int]:
+        """
+        Find subtitles matching all given criteria.
+
+        The result can be passed as ``selection`` to :meth:`SSAFile.shift()`
+        and :meth:`SSAFile.transform_framerate()`, or as ``indices`` to methods
+        of :class:`pysubs2.timings.EventTimings` for bulk retiming of part of the file.
+
+        Arguments:
+            style: Subtitles with this style.
+            layer: Subtitles in this layer.
+            time_range: Subtitles visible at some point of time interval ``[start, end)``
+                in milliseconds, see :meth:`SSAFile.between()`.
+            indices: Subtitles with these indices.
+            predicate: Subtitles for which this function returns True.
+
+        Returns:
+            Sorted list of indices into :attr:`SSAFile.events`. With no criteria given,
+            all subtitles are selected.
+
+        Raises:
+            IndexError: Index out of range.
+
+        Example:
+            >>> # move signs in the first minute 200 ms later
+            >>> subs.shift(ms=200, selection=subs.select(style="Signs", time_range=(0, make_time(m=1))))
+
+            >>> # rescale dialogue in the second half of file
+            >>> timings = subs.get_timings()
+            >>> timings.scale(25 / 23.976, indices=subs.select(predicate=lambda line: line.start >= midpoint))
+            >>> subs.set_timings(timings)
+
+        .. versionadded:: 1.9.0
+
+        """
+        candidates: Iterable[int]
+        if indices is not None:
+            candidates = sorted(set(indices))
+            if candidates and (candidates[0] < 0 or candidates[-1] >= len(self.events)):
+                raise IndexError(f"Subtitle index out of range: {candidates[0]}..{candidates[-1]}")
+            if time_range is not None:
+                visible = set(self._get_interval_index().between(*time_range))
+                candidates = [i for i in candidates if i in visible]
+        elif time_range is not None:
+            candidates = self._get_interval_index().between(*time_range)
+        else:
+            candidates = range(len(self.events))
+
+        if style is None and layer is None and predicate is None:
+            return list(candidates)
+
+        events = self.events
+        output = []
+        for i in candidates:
+            line = events[i]
+            if ((style is None or line.style == style)
+                    and (layer is None or line.layer == layer)
+                    and (predicate is None or predicate(line))):
+                output.append(i)
+        return output
+
+    def _get_selected_events(self, selection: Optional[Iterable[int]]) -> List[SSAEvent]:
+        if selection is None:
+            return self.events
+        events = self.events
+        # like select(), each subtitle is taken once even if its index is repeated
+        return [events[i] for i in sorted(set(selection))]
+
+    def get_timings(self) -> EventTimings:
+        """
+        Get start and end times of all subtitles in columnar form.
+
+        The result is a copy, modifying it doesn't affect the subtitles
+        unless you call :meth:`SSAFile.set_timings()`.
+
+        Returns:
+            :class:`pysubs2.timings.EventTimings`
+
+        .. versionadded:: 1.9.0
+
+        """
+        return EventTimings.from_events(self.events)
+
+    def set_timings(self, timings: EventTimings) -> int:
+        """
+        Set start and end times of all subtitles from columnar form.
+
+        Arguments:
+            timings (EventTimings): Timings with one entry for each subtitle,
+                see :meth:`SSAFile.get_timings()`.
+
+        Returns:
+            Number of subtitles whose start or end time was changed.
+
+        Raises:
+            ValueError: Number of timings doesn't match number of subtitles.
+
+        .. versionadded:: 1.9.0
+
+        """
+        changed = timings.apply(self.events)
+        self.invalidate_caches()
+        return changed
 
     # ------------------------------------------------------------------------
     # Working with styles
@@ -399,26 +712,96 @@ class SSAFile(MutableSequence[SSAEvent]):
         - Duplicated text with identical time interval (only the first event is kept)
         """
         new_events = []
+        seen: Set[Tuple[int, int, str]] = set()  # (start, end, plaintext) of all events so far, including removed ones
 
-        duplicate_text_ids = set()
-        times_to_texts: Dict[Tuple[int, int], List[str]] = {}
-        for i, e in enumerate(self):
-            tmp = times_to_texts.setdefault((e.start, e.end), [])
-            if tmp.count(e.plaintext) > 0:
-                duplicate_text_ids.add(i)
-            tmp.append(e.plaintext)
-
-        for i, e in enumerate(self):
-            if e.is_drawing or e.is_comment:
-                continue
-            if len(e.plaintext.strip()) < 2:
+        for e in self:
+            plaintext = e.plaintext
+            key = (e.start, e.end, plaintext)
+            if key in seen:
                 continue
-            if i in duplicate_text_ids:
+            seen.add(key)
+
+            # cheap checks first, is_drawing may need to parse override tags
+            if e.is_comment or len(plaintext.strip()) < 2 or e.is_drawing:
                 continue
 
             new_events.append(e)
 
         self.events = new_events
+        self.invalidate_caches()
+
+    def at(self, ms: int) -> List[SSAEvent]:
+        """
+        Return subtitles which are visible at given time.
+
+        Subtitle is visible from its start time (inclusive) to its end time (exclusive).
+        The result is in the same order as :attr:`SSAFile.events` and includes comments
+        and drawings (see :meth:`SSAEvent.is_text`).
+
+        Queries use an index which is built on first use in ``O(n log n)`` time, after that
+        they take ``O(log n + k)`` time, where ``k`` is the number of results. The index is
+        rebuilt when the file is modified via :class:`SSAFile` methods (eg. ``insert()``, ``del subs[i]``,
+        :meth:`SSAFile.shift()`), but it cannot know about in-place changes of individual events
+        (eg. ``subs[0].start = 0``); call :meth:`SSAFile.invalidate_caches()` after those.
+
+        Arguments:
+            ms (int): Time in milliseconds.
+
+        Returns:
+            List of :class:`SSAEvent`
+
+        Example:
+            >>> subs.at(make_time(h=1, m=23, s=45))
+            [<SSAEvent type=Dialogue start=1:23:44 end=1:23:47 text='Hello!'>]
+
+        .. versionadded:: 1.9.0
+
+        """
+        events = self.events
+        return [events[i] for i in self._get_interval_index().at(ms)]
+
+    def between(self, start: int, end: int) -> List[SSAEvent]:
+        """
+        Return subtitles which are visible at any time between start (inclusive) and end (exclusive).
+
+        See :meth:`SSAFile.at()` for details.
+
+        Arguments:
+            start (int): Start time in milliseconds.
+            end (int): End time in milliseconds.
+
+        Returns:
+            List of :class:`SSAEvent`
+
+        .. versionadded:: 1.9.0
+
+        """
+        events = self.events
+        return [events[i] for i in self._get_interval_index().between(start, end)]
+
+    def invalidate_caches(self) -> None:
+        """
+        Discard cached data derived from subtitles, like the index used by :meth:`SSAFile.at()`.
+
+        This is done automatically when the file is modified via :class:`SSAFile` methods;
+        you only need to call this after modifying :attr:`SSAFile.events` or individual
+        events directly.
+
+        .. versionadded:: 1.9.0
+
+        """
+        self._interval_index = None
+
+    def _get_interval_index(self) -> IntervalIndex:
+        # also check for direct assignment/modification of self.events list
+        if self._interval_index is not None:
+            events, index = self._interval_index
+            if events is self.events and index.size == len(events):
+                return index
+
+        index = IntervalIndex(self.get_timings())
+        self._interval_index = self.events, index
+        return index
 
     def get_text_events(self) -> List[SSAEvent]:
         """
@@ -434,78 +817,93 @@ class SSAFile(MutableSequence[SSAEvent]):
         Order of entries in OrderedDicts does not matter. "ScriptType" key in info is
         considered an implementation detail and thus ignored.
 
-        Useful mostly in unit tests. Differences are logged at DEBUG level.
+        Useful mostly in unit tests. The first difference found is logged at DEBUG level,
+        use :meth:`SSAFile.diff()` to get all of them.
 
         """
+        if isinstance(other, SSAFile):
+            diff = self._diff(other, stop_at_first=True)
+            if diff:
+                logging.debug("files differ: %r", diff)
+            return not diff
+        else:
+            raise TypeError("Cannot compare to non-SSAFile object")
+
+    def diff(self, other: "SSAFile") -> "SSAFileDiff":
+        """
+        Find differences between two SSAFiles.
+
+        Compares the same data as :meth:`SSAFile.equals()`, but instead of stopping at the first
+        difference, returns all keys and event indices which differ::
 
+            >>> diff = subs.diff(other_subs)
+            >>> if diff:
+            ...     print("Changed events:", diff.events)
+
+        Returns:
+            :class:`SSAFileDiff` which is falsy if the files are equal.
+
+        Raises:
+            TypeError: If other is not an SSAFile.
+
+        .. versionadded:: 1.9.0
+
+        """
         if isinstance(other, SSAFile):
-            for key in set(chain(self.info.keys(), other.info.keys())) - {"ScriptType"}:
-                self_info, other_info = self.info.get(key), other.info.get(key)
-                if self_info is None:
-                    logging.debug("%r missing in self.info", key)
-                    return False
-                elif other_info is None:
-                    logging.debug("%r missing in other.info", key)
-                    return False
-                elif self_info != other_info:
-                    logging.debug("info %r differs (self=%r, other=%r)", key, self_info, other_info)
-                    return False
-
-            for key in set(chain(self.fonts_opaque.keys(), other.fonts_opaque.keys())):
-                self_font, other_font = self.fonts_opaque.get(key), other.fonts_opaque.get(key)
-                if self_font is None:
-                    logging.debug("%r missing in self.fonts_opaque", key)
-                    return False
-                elif other_font is None:
-                    logging.debug("%r missing in other.fonts_opaque", key)
-                    return False
-                elif self_font != other_font:
-                    logging.debug("fonts_opaque %r differs (self=%r, other=%r)", key, self_font, other_font)
-                    return False
-
-            for key in set(chain(self.graphics_opaque.keys(), other.graphics_opaque.keys())):
-                self_image, other_image = self.graphics_opaque.get(key), other.graphics_opaque.get(key)
-                if self_image is None:
-                    logging.debug("%r missing in self.graphics_opaque", key)
-                    return False
-                elif other_image is None:
-                    logging.debug("%r missing in other.graphics_opaque", key)
-                    return False
-                elif self_image != other_image:
-                    logging.debug("graphics_opaque %r differs (self=%r, other=%r)", key, self_image, other_image)
-                    return False
-
-            for key in set(chain(self.styles.keys(), other.styles.keys())):
-                self_style, other_style = self.styles.get(key), other.styles.get(key)
-                if self_style is None:
-                    logging.debug("%r missing in self.styles", key)
-                    return False
-                elif other_style is None:
-                    logging.debug("%r missing in other.styles", key)
-                    return False
-                elif self_style != other_style:
-                    for k in self_style.FIELDS:
-                        if getattr(self_style, k) != getattr(other_style, k):
-                            logging.debug("difference in field %r", k)
-                    logging.debug("style %r differs (self=%r, other=%r)", key, self_style.as_dict(), other_style.as_dict())
-                    return False
-
-            if len(self) != len(other):
-                logging.debug("different # of subtitles (self=%d, other=%d)", len(self), len(other))
-                return False
-
-            for i, (self_event, other_event) in enumerate(zip(self.events, other.events)):
-                if not self_event.equals(other_event):
-                    for k in self_event.FIELDS:
-                        if getattr(self_event, k) != getattr(other_event, k):
-                            logging.debug("difference in field %r", k)
-                    logging.debug("event %d differs (self=%r, other=%r)", i, self_event.as_dict(), other_event.as_dict())
-                    return False
-
-            return True
+            return self._diff(other, stop_at_first=False)
         else:
             raise TypeError("Cannot compare to non-SSAFile object")
 
+    def _diff(self, other: "SSAFile", stop_at_first: bool) -> "SSAFileDiff":
+        diff = SSAFileDiff()
+        diff.info = _diff_mappings(self.info, other.info, stop_at_first, ignore={"ScriptType"})
+        if stop_at_first and diff:
+            return diff
+        diff.fonts_opaque = _diff_mappings(self.fonts_opaque, other.fonts_opaque, stop_at_first)
+        if stop_at_first and diff:
+            return diff
+        diff.graphics_opaque = _diff_mappings(self.graphics_opaque, other.graphics_opaque, stop_at_first)
+        if stop_at_first and diff:
+            return diff
+        diff.styles = _diff_mappings(self.styles, other.styles, stop_at_first)
+        if stop_at_first and diff:
+            return diff
+
+        # compare plain tuples of field values instead of calling SSAEvent.equals() for each pair
+        self_values = map(dataclass_field_values, self.events)
+        other_values = map(dataclass_field_values, other.events)
+        for i, equal in enumerate(map(operator.eq, self_values, other_values)):
+            if not equal:
+                diff.events.append(i)
+                if stop_at_first:
+                    return diff
+        diff.events.extend(range(min(len(self), len(other)), max(len(self), len(other))))
+
+        return diff
+
+    def fingerprint(self) -> int:
+        """
+        Hash of the data compared by :meth:`SSAFile.equals()`.
+
+        Files which are equal have the same fingerprint, so it can be stored to cheaply check
+        whether the file was modified later, or to find duplicates among many files. Different
+        files may collide, use :meth:`SSAFile.equals()` to confirm a match. Unlike builtin ``hash()``,
+        the value is stable across Python processes (it's a 64-bit BLAKE2 digest).
+
+        See also :meth:`SSAEvent.fingerprint()` and :meth:`SSAStyle.fingerprint()`.
+
+        .. versionadded:: 1.9.0
+
+        """
+        # mappings are compared regardless of order, so their items are sorted
+        info = sorted((key, value) for key, value in self.info.items() if key != "ScriptType")
+        fonts = sorted((key, tuple(lines)) for key, lines in self.fonts_opaque.items())
+        graphics = sorted((key, tuple(lines)) for key, lines in self.graphics_opaque.items())
+        styles = sorted((key, canonical_field_values(style)) for key, style in self.styles.items())
+        # events are hashed one by one, so that memory use doesn't depend on their number
+        header = (info, fonts, graphics, styles, len(self.events))
+        return stable_hash(chain([header], map(canonical_field_values, self.events)))
+
     def __repr__(self) -> str:
         if self.events:
             max_time = max(ev.end for ev in self)
@@ -520,8 +918,30 @@ class SSAFile(MutableSequence[SSAEvent]):
     # ------------------------------------------------------------------------
 
     def sort(self) -> None:
-        """Sort subtitles time-wise, in-place."""
-        self.events.sort()
+        """
+        Sort subtitles time-wise, in-place.
+
+        This also invalidates cached data (see :meth:`SSAFile.invalidate_caches()`), even if the order
+        did not change, since times may have been modified in-place.
+
+        """
+        # this is equivalent to self.events.sort(), but it's faster to compare tuples than to call SSAEvent.__lt__();
+        # sorting takes linear time for sorted input or input with a few subtitles appended out of order
+        self.events.sort(key=attrgetter("start", "end"))
+        self.invalidate_caches()
+
+    def is_sorted(self) -> bool:
+        """
+        Return True if subtitles are sorted time-wise, ie. :meth:`SSAFile.sort()` would not change their order.
+
+        This takes ``O(n)`` time.
+
+        .. versionadded:: 1.9.0
+
+        """
+        events = self.events
+        key = attrgetter("start", "end")
+        return all(map(operator.le, map(key, events), map(key, islice(events, 1, None))))
 
     def __iter__(self) -> Iterator[SSAEvent]:
         return iter(self.events)
@@ -549,12 +969,14 @@ class SSAFile(MutableSequence[SSAEvent]):
         if isinstance(key, int):
             if isinstance(value, SSAEvent):
                 self.events[key] = value
+                self.invalidate_caches()
             else:
                 raise TypeError("SSAFile.events must contain only SSAEvent objects")
         elif isinstance(key, slice):
             values = list(value)
             if all(isinstance(v, SSAEvent) for v in values):
                 self.events[key] = values
+                self.invalidate_caches()
             else:
                 raise TypeError("SSAFile.events must contain only SSAEvent objects")
         else:
@@ -570,6 +992,7 @@ class SSAFile(MutableSequence[SSAEvent]):
 
     def __delitem__(self, key: Any) -> None:
         del self.events[key]
+        self.invalidate_caches()
 
     def __len__(self) -> int:
         return len(self.events)
@@ -577,8 +1000,45 @@ class SSAFile(MutableSequence[SSAEvent]):
     def insert(self, index: int, value: SSAEvent) -> None:
         if isinstance(value, SSAEvent):
             self.events.insert(index, value)
+            self.invalidate_caches()
         else:
             raise TypeError("SSAFile.events must contain only SSAEvent objects")
 
 
 from .formats import autodetect_format, get_format_class, get_format_identifier  # noqa: E402
+from .formats.substation import LazyAttachmentDict  # noqa: E402
+
+
+@dataclasses.dataclass
+class SSAFileDiff:
+    """
+    Differences between two subtitle files, as returned by :meth:`SSAFile.diff()`.
+
+    Keys and indices present in only one of the files are included. The object is truthy
+    if there is any difference.
+
+    .. versionadded:: 1.9.0
+
+    """
+    info: List[str] = dataclasses.field(default_factory=list)  #: Differing keys of :attr:`SSAFile.info`
+    styles: List[str] = dataclasses.field(default_factory=list)  #: Differing keys of :attr:`SSAFile.styles`
+    fonts_opaque: List[str] = dataclasses.field(default_factory=list)  #: Differing keys of :attr:`SSAFile.fonts_opaque`
+    graphics_opaque: List[str] = dataclasses.field(default_factory=list)  #: Differing keys of :attr:`SSAFile.graphics_opaque`
+    events: List[int] = dataclasses.field(default_factory=list)  #: Differing indices into :attr:`SSAFile.events`
+
+    def __bool__(self) -> bool:
+        return bool(self.info or self.styles or self.fonts_opaque or self.graphics_opaque or self.events)
+
+
+def _diff_mappings(a: Mapping[str, Any], b: Mapping[str, Any], stop_at_first: bool,
+                   ignore: AbstractSet[str] = frozenset()) -> List[str]:
+    """Return sorted keys which differ between the mappings, or just the first found"""
+    if a == b:
+        return []
+    keys = []
+    for key in sorted(set(chain(a.keys(), b.keys())) - ignore):
+        if key not in a or key not in b or a[key] != b[key]:
+            keys.append(key)
+            if stop_at_first:
+                break
+    return keys
@@ -2,7 +2,7 @@ import warnings
 from typing import Dict, Any, ClassVar, FrozenSet
 import dataclasses
 
-from .common import Color, Alignment
+from .common import Color, Alignment, canonical_field_values, stable_hash
 
 @dataclasses.dataclass(repr=False)
 class SSAStyle:
@@ -60,12 +60,27 @@ class SSAStyle:
     drawing: bool = False  #: Indicates that text span is a SSA vector drawing, see :func:`pysubs2.substation.parse_tags()`
 
     def copy(self) -> "SSAStyle":
-        return SSAStyle(**self.as_dict())
+        # shallow copy like SSAStyle(**self.as_dict()), without the overhead of dataclasses.fields()
+        style = SSAStyle.__new__(SSAStyle)
+        style.__dict__.update(self.__dict__)
+        return style
 
     def as_dict(self) -> Dict[str, Any]:
         # dataclasses.asdict() would recursively dictify Color objects, which we don't want
         return {field.name: getattr(self, field.name) for field in dataclasses.fields(self)}
 
+    def fingerprint(self) -> int:
+        """
+        Hash of all fields, styles which are equal have the same fingerprint.
+
+        Unlike builtin ``hash()``, the value is stable, so it can be stored and compared
+        across Python processes.
+
+        .. versionadded:: 1.9.0
+
+        """
+        return stable_hash([canonical_field_values(self)])
+
     def __repr__(self) -> str:
         return f"<SSAStyle {self.fontsize!r}px" \
                f"{' bold' if self.bold else ''}" \
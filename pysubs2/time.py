@@ -1,5 +1,6 @@
+import functools
 import re
-from typing import Optional, Sequence, NamedTuple
+from typing import Optional, Sequence, NamedTuple, Callable, Dict
 
 from .common import IntOrFloat
 
@@ -10,6 +11,12 @@ TIMESTAMP = re.compile(r"(\d{1,2}):(\d{1,2}):(\d{1,2})[.,](\d{1,3})")
 TIMESTAMP_SHORT = re.compile(r"(\d{1,2}):(\d{2}):(\d{2})")
 
 
+#: Maximum number of entries kept by each function decorated with :func:`pysubs2.time.memoize_timestamp_format()`.
+TIMESTAMP_CACHE_SIZE = 4096
+
+_TIMESTAMP_CACHES: Dict[str, "functools._lru_cache_wrapper[str]"] = {}
+
+
 class Times(NamedTuple):
     """Named tuple (h, m, s, ms) of ints."""
     h: int
@@ -176,3 +183,47 @@ def ms_to_str(ms: IntOrFloat, fractions: bool = False) -> str:
         return f"{sgn}{h:01d}:{m:02d}:{s:02d}.{ms:03d}"
     else:
         return f"{sgn}{h:01d}:{m:02d}:{s:02d}"
+
+
+def memoize_timestamp_format(func: Callable[[int], str]) -> Callable[[int], str]:
+    """
+    Decorator which adds a LRU cache to a function formatting timestamps.
+
+    Subtitle writers use this for their timestamp formatting functions, since subtitle
+    files tend to reuse the same timestamps (eg. end of one subtitle is the start
+    of the next one). Each decorated function gets its own cache of size
+    :data:`pysubs2.time.TIMESTAMP_CACHE_SIZE`; statistics for all of them are available
+    via :func:`pysubs2.time.timestamp_cache_info()`.
+
+    Note:
+        The function should only do the formatting itself, since repeated calls with the same
+        value will not execute it again. In particular, handling of out-of-range values
+        with warnings should be done by the caller.
+
+    """
+    cached_func = functools.lru_cache(maxsize=TIMESTAMP_CACHE_SIZE)(func)
+    _TIMESTAMP_CACHES[f"{func.__module__}.{func.__qualname__}"] = cached_func
+    return cached_func
+
+
+def timestamp_cache_info() -> Dict[str, "functools._CacheInfo"]:
+    """
+    Return cache statistics (hits, misses, etc.) for timestamp formatting functions.
+
+    Returns:
+        Dict mapping function name to named tuple ``(hits, misses, maxsize, currsize)``,
+        see :func:`functools.lru_cache()`.
+
+    Example:
+        >>> subs.to_string("srt")
+        >>> timestamp_cache_info()
+        {'pysubs2.formats.subrip._format_timestamp': CacheInfo(hits=999, misses=1001, maxsize=4096, currsize=1001), ...}
+
+    """
+    return {name: func.cache_info() for name, func in _TIMESTAMP_CACHES.items()}
+
+
+def clear_timestamp_caches() -> None:
+    """Clear caches (and statistics) of timestamp formatting functions."""
+    for func in _TIMESTAMP_CACHES.values():
+        func.cache_clear()
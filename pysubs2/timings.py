@@ -0,0 +1,342 @@
+import math
+from array import array
+from bisect import bisect_right
+from typing import Iterable, Iterator, List, Sequence, Tuple, Optional, cast
+
+from .ssaevent import SSAEvent
+
+
+def _to_int_array(values: Sequence[float]) -> "array[int]":
+    try:
+        return array("q", cast(Sequence[int], values))
+    except TypeError:
+        # some times are not integers (eg. floats), round them to milliseconds
+        return array("q", [round(x) for x in values])
+
+
+class EventTimings:
+    """
+    Start and end times of subtitles in columnar form.
+
+    Times are kept in two parallel arrays of integers (milliseconds), :attr:`EventTimings.starts`
+    and :attr:`EventTimings.ends`, which are compact and cheap to process as a whole. This is useful
+    for bulk operations on large files; get an instance via :meth:`pysubs2.SSAFile.get_timings()`,
+    modify it and write it back with :meth:`pysubs2.SSAFile.set_timings()`. The subtitles
+    themselves (ie. :class:`pysubs2.SSAEvent` instances in :attr:`pysubs2.SSAFile.events`)
+    are not affected until then.
+
+    Note that bulk operations are not vectorized (as with NumPy, which is not a dependency); they are
+    plain Python loops over the arrays. They are still considerably faster than modifying
+    :class:`pysubs2.SSAEvent` objects one by one, since no attribute access is involved.
+
+    Example:
+        >>> timings = subs.get_timings()
+        >>> timings.shift(1500)
+        >>> timings.scale(25 / 23.976)
+        >>> subs.set_timings(timings)
+
+    .. versionadded:: 1.9.0
+
+    """
+
+    def __init__(self, starts: Sequence[float] = (), ends: Sequence[float] = ()) -> None:
+        if len(starts) != len(ends):
+            raise ValueError(f"Got {len(starts)} start times but {len(ends)} end times")
+        self.starts = _to_int_array(starts)  #: Start times in milliseconds (``array`` of ints)
+        self.ends = _to_int_array(ends)  #: End times in milliseconds (``array`` of ints)
+
+    @classmethod
+    def from_events(cls, events: Iterable[SSAEvent]) -> "EventTimings":
+        """Get timings of given subtitles."""
+        events = list(events)
+        return cls([ev.start for ev in events], [ev.end for ev in events])
+
+    def apply(self, events: Sequence[SSAEvent]) -> int:
+        """
+        Write timings to given subtitles.
+
+        Arguments:
+            events: Subtitles to modify, there must be one for each timing.
+
+        Returns:
+            Number of subtitles whose start or end time was changed.
+
+        Raises:
+            ValueError: Number of subtitles does not match.
+
+        """
+        if len(events) != len(self):
+            raise ValueError(f"Cannot apply {len(self)} timings to {len(events)} subtitles")
+
+        changed = 0
+        for ev, start, end in zip(events, self.starts, self.ends):
+            if ev.start != start or ev.end != end:
+                ev.start = start
+                ev.end = end
+                changed += 1
+        return changed
+
+    def copy(self) -> "EventTimings":
+        """Return a copy of the timings."""
+        return EventTimings(self.starts, self.ends)
+
+    def shift(self, delta: int, indices: Optional[Iterable[int]] = None) -> None:
+        """
+        Add given number of milliseconds to all times.
+
+        Arguments:
+            delta: Milliseconds to add, may be negative.
+            indices: If given, only these timings are changed (each one once, duplicate indices are ignored).
+
+        .. versionchanged:: 1.9.0
+            Added the ``indices`` parameter.
+
+        """
+        if indices is None:
+            self.starts = array("q", [t + delta for t in self.starts])
+            self.ends = array("q", [t + delta for t in self.ends])
+        else:
+            starts, ends = self.starts, self.ends
+            for i in set(indices):
+                starts[i] += delta
+                ends[i] += delta
+
+    def scale(self, ratio: float, indices: Optional[Iterable[int]] = None) -> None:
+        """
+        Multiply all times by given ratio (rounding to milliseconds).
+
+        Arguments:
+            ratio: Ratio to multiply the times by.
+            indices: If given, only these timings are changed (each one once, duplicate indices are ignored).
+
+        .. versionchanged:: 1.9.0
+            Added the ``indices`` parameter.
+
+        """
+        if indices is None:
+            self.starts = array("q", [round(t * ratio) for t in self.starts])
+            self.ends = array("q", [round(t * ratio) for t in self.ends])
+        else:
+            starts, ends = self.starts, self.ends
+            for i in set(indices):
+                starts[i] = round(starts[i] * ratio)
+                ends[i] = round(ends[i] * ratio)
+
+    def map_piecewise(self, anchors: Sequence[Tuple[int, int]], indices: Optional[Iterable[int]] = None) -> None:
+        """
+        Transform all times by piecewise-linear mapping (rounding to milliseconds).
+
+        The mapping is given by anchor points ``(old time, new time)``: each anchor is mapped exactly,
+        times between two anchors are interpolated linearly and times outside the anchors are extrapolated
+        using the first or last segment. A single anchor means constant shift.
+
+        Times are mapped in a single pass which walks the anchors along with the times, so this takes
+        ``O(n + anchors)`` time when the times are (mostly) sorted, which is usually the case for subtitles.
+        Other jumps between segments are handled by binary search, so the worst case is ``O(n log(anchors))``.
+
+        Arguments:
+            anchors: Pairs of ``(old time, new time)`` in milliseconds, sorted by old time.
+            indices: If given, only these timings are changed (each one once, duplicate indices are ignored).
+
+        Raises:
+            ValueError: No anchors given, or old times are not strictly increasing.
+
+        Example:
+            >>> # subtitles drift by 2 seconds over the first hour, then they are in sync
+            >>> timings.map_piecewise([(0, 0), (make_time(h=1), make_time(h=1, s=2)), (make_time(h=2), make_time(h=2))])
+
+        """
+        boundaries, segments = _get_piecewise_segments(anchors)
+        if len(segments) == 1 and segments[0][0] == 1:
+            self.shift(int(segments[0][1]), indices)
+            return
+
+        if indices is None:
+            self.starts = array("q", _map_piecewise(self.starts, boundaries, segments))
+            self.ends = array("q", _map_piecewise(self.ends, boundaries, segments))
+        else:
+            indices = sorted(set(indices))
+            starts, ends = self.starts, self.ends
+            new_starts = _map_piecewise([starts[i] for i in indices], boundaries, segments)
+            new_ends = _map_piecewise([ends[i] for i in indices], boundaries, segments)
+            for i, start, end in zip(indices, new_starts, new_ends):
+                starts[i] = start
+                ends[i] = end
+
+    def argsort(self) -> List[int]:
+        """Return indices which would sort the timings by (start, end), like :meth:`pysubs2.SSAFile.sort()`."""
+        # stable sort by secondary key, then by primary key, avoids building (start, end) tuples
+        order = sorted(range(len(self)), key=self.ends.__getitem__)
+        order.sort(key=self.starts.__getitem__)
+        return order
+
+    def overlapping(self, start: int, end: int) -> List[int]:
+        """
+        Return indices of subtitles which are visible at some point of time interval ``[start, end)``.
+
+        Subtitles with zero or negative duration are never visible.
+
+        """
+        return [i for i, (s, e) in enumerate(zip(self.starts, self.ends)) if s < end and e > start and s < e]
+
+    def __getitem__(self, i: int) -> Tuple[int, int]:
+        return self.starts[i], self.ends[i]
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        return zip(self.starts, self.ends)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, EventTimings):
+            return NotImplemented
+        return self.starts == other.starts and self.ends == other.ends
+
+    def __repr__(self) -> str:
+        return f"<EventTimings of {len(self)} subtitles>"
+
+
+def _get_piecewise_segments(anchors: Sequence[Tuple[int, int]]) -> Tuple[List[int], List[Tuple[float, float]]]:
+    """
+    Return segments of piecewise-linear mapping given by anchors
+
+    Segment ``i`` is a ``(slope, intercept)`` pair which applies from ``boundaries[i-1]``
+    to ``boundaries[i]``; the first and last segment extend to infinity.
+
+    """
+    if not anchors:
+        raise ValueError("No anchors given")
+    sources = [src for src, _ in anchors]
+    if any(a >= b for a, b in zip(sources, sources[1:])):
+        raise ValueError("Anchors must be sorted by old time, which must be unique")
+
+    if len(anchors) == 1:
+        (src, dst), = anchors
+        return [], [(1, dst - src)]
+
+    segments = []
+    for (src1, dst1), (src2, dst2) in zip(anchors, anchors[1:]):
+        slope = (dst2 - dst1) / (src2 - src1)
+        segments.append((slope, dst1 - slope * src1))
+    return sources[1:-1], segments
+
+
+def _map_piecewise(values: Iterable[int], boundaries: List[int], segments: List[Tuple[float, float]]) -> List[int]:
+    """Apply piecewise-linear mapping from :func:`_get_piecewise_segments()`, merging values with segment boundaries"""
+    bounds = [-math.inf, *boundaries, math.inf]  # segment k applies from bounds[k] to bounds[k+1]
+    k = 0
+    low, high = bounds[0], bounds[1]
+    slope, intercept = segments[0]
+    output = []
+    for t in values:
+        if not low <= t < high:
+            if t >= high and t < bounds[k + 2]:
+                # usual case for sorted values, move to the next segment
+                k += 1
+            else:
+                k = bisect_right(boundaries, t)
+            low, high = bounds[k], bounds[k + 1]
+            slope, intercept = segments[k]
+        output.append(round(slope * t + intercept))
+    return output
+
+
+#: Node of interval tree: (center, [(start, index), ...] sorted by start,
+#: [(end, index), ...] sorted by end in descending order, left subtree, right subtree)
+_Node = Tuple[int, List[Tuple[int, int]], List[Tuple[int, int]], Optional["_Node"], Optional["_Node"]]
+
+
+class IntervalIndex:
+    """
+    Index for fast time-based queries on subtitles.
+
+    This is a static (centered) interval tree built from :class:`EventTimings`. It answers
+    queries in ``O(log n + k)`` time, where ``k`` is the number of results. Subtitle with start time ``s``
+    and end time ``e`` is considered to be visible in the half-open time interval ``[s, e)``; subtitles
+    with zero or negative duration are never visible and are not included in the index.
+
+    Usually, you don't need to use this class directly, see :meth:`pysubs2.SSAFile.at()`
+    and :meth:`pysubs2.SSAFile.between()`.
+
+    .. versionadded:: 1.9.0
+
+    """
+
+    def __init__(self, timings: EventTimings) -> None:
+        self.size = len(timings)  #: Number of timings the index was built from
+        starts, ends = timings.starts, timings.ends
+        visible = sorted((i for i in range(self.size) if starts[i] < ends[i]), key=starts.__getitem__)
+        self._root = self._build(visible, starts, ends)
+
+    @classmethod
+    def _build(cls, indices: List[int], starts: "array[int]", ends: "array[int]") -> Optional[_Node]:
+        # indices are sorted by start time
+        if not indices:
+            return None
+
+        center = starts[indices[len(indices) // 2]]
+        left, here, right = [], [], []
+        for i in indices:
+            if ends[i] <= center:
+                left.append(i)
+            elif starts[i] > center:
+                right.append(i)
+            else:
+                here.append(i)
+
+        by_start = [(starts[i], i) for i in here]
+        by_end = sorted(((ends[i], i) for i in here), reverse=True)
+        return center, by_start, by_end, cls._build(left, starts, ends), cls._build(right, starts, ends)
+
+    def at(self, ms: int) -> List[int]:
+        """Return sorted indices of subtitles visible at given time."""
+        output: List[int] = []
+        node = self._root
+        while node is not None:
+            center, by_start, by_end, left, right = node
+            if ms < center:
+                for start, i in by_start:
+                    if start > ms:
+                        break
+                    output.append(i)
+                node = left
+            else:
+                for end, i in by_end:
+                    if end <= ms:
+                        break
+                    output.append(i)
+                node = right
+        output.sort()
+        return output
+
+    def between(self, start: int, end: int) -> List[int]:
+        """Return sorted indices of subtitles visible at some point of time interval ``[start, end)``."""
+        output: List[int] = []
+        if start >= end:
+            return output
+
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            if node is None:
+                continue
+            center, by_start, by_end, left, right = node
+            if end <= center:
+                for s, i in by_start:
+                    if s >= end:
+                        break
+                    output.append(i)
+                stack.append(left)
+            elif start > center:
+                for e, i in by_end:
+                    if e <= start:
+                        break
+                    output.append(i)
+                stack.append(right)
+            else:
+                output.extend(i for _, i in by_start)
+                stack.append(left)
+                stack.append(right)
+        output.sort()
+        return output
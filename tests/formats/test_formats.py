@@ -48,3 +48,24 @@ def test_97_format_detection_multiprocessing_error() -> None:
             pool.starmap(_test_97_func, zip(range(4), itertools.repeat(0)))
         with pytest.raises(pysubs2.FormatAutodetectionError):
             pool.starmap(_test_97_func, zip(range(4), itertools.repeat(1)))
+
+
+def test_format_detection_by_signature() -> None:
+    subs = pysubs2.SSAFile()
+    subs.append(pysubs2.SSAEvent(start=0, end=1000, text="Hello"))
+    for format_ in ["srt", "ass", "ssa", "vtt", "json", "ttml"]:
+        text = subs.to_string(format_)
+        assert pysubs2.formats.autodetect_format(text) == format_
+        assert pysubs2.formats.autodetect_format("\ufeff" + text) == format_
+
+    # would be ambiguous with MPL2 when trying all formats
+    text = subs.to_string("ass") + "[1][2]\n"
+    assert pysubs2.formats.autodetect_format(text) == "ass"
+
+
+def test_format_detection_timings() -> None:
+    text = pysubs2.SSAFile.from_string("[10][20]Hello").to_string("mpl2")
+    timings = pysubs2.formats.autodetect_format_timings(text)
+    assert len(timings) == len(set(pysubs2.formats.FORMAT_IDENTIFIER_TO_FORMAT_CLASS.values()))
+    assert [t.guess for t in timings if t.guess is not None] == ["mpl2"]
+    assert all(t.seconds >= 0 for t in timings)
@@ -7,7 +7,8 @@ import tempfile
 from textwrap import dedent
 import pytest
 
-from pysubs2 import SSAFile, SSAEvent, make_time
+import pysubs2
+from pysubs2 import SSAFile, SSAEvent, SSAStyle, make_time
 from pysubs2.formats.subrip import MAX_REPRESENTABLE_TIME
 
 
@@ -196,6 +197,31 @@ def test_empty_subtitles() -> None:
     assert subs.equals(ref)
 
 
+def test_iter_events() -> None:
+    text = dedent("""\
+    1
+    00:00:10,500 --> 00:00:13,000
+    <i>Elephant's</i> Dream
+
+    2
+    00:00:15,000 --> 00:00:18,000
+    Two
+    lines
+    """)
+
+    with tempfile.TemporaryDirectory() as dirpath:
+        path = op.join(dirpath, "test.srt")
+        with open(path, "w") as fp:
+            fp.write(text)
+
+        header = SSAFile()
+        events = pysubs2.iter_events(path, header=header)
+        first = next(events)
+        assert first.equals(SSAEvent(start=make_time(s=10.5), end=make_time(s=13), text="{\\i1}Elephant's{\\i0} Dream"))
+        assert header.format == "srt"
+        assert [ev.text for ev in events] == ["Two\\Nlines"]
+
+
 def test_keep_unknown_html_tags() -> None:
     # see issue #26
     text = dedent("""\
@@ -252,6 +278,27 @@ def test_write_drawing() -> None:
     assert text.strip() == ref.strip()
 
 
+def test_write_line_style() -> None:
+    subs = SSAFile()
+    subs.styles["Italic"] = SSAStyle(italic=True)
+    subs.append(SSAEvent(start=0, end=1000, text="styled line", style="Italic"))
+    subs.append(SSAEvent(start=1000, end=2000, text="plain\\N\\Nline"))
+
+    ref = dedent("""\
+    1
+    00:00:00,000 --> 00:00:01,000
+    <i>styled line</i>
+
+    2
+    00:00:01,000 --> 00:00:02,000
+    plain
+    line
+    """)
+
+    assert subs.to_string("srt").strip() == ref.strip()
+    assert subs.to_string("srt", apply_styles=False).strip() == ref.replace("<i>", "").replace("</i>", "").strip()
+
+
 def test_keep_ssa_tags() -> None:
     # test for issue #48
     input_text = dedent("""\
@@ -3,9 +3,12 @@ pysubs2.formats.substation tests
 
 """
 import typing
+import tempfile
+import os.path as op
 from textwrap import dedent
+import pysubs2
 from pysubs2 import SSAFile, SSAEvent, SSAStyle, make_time, Color, Alignment
-from pysubs2.formats.substation import color_to_ass_rgba, color_to_ssa_rgb, rgba_to_color, MAX_REPRESENTABLE_TIME, SubstationFormat
+from pysubs2.formats.substation import color_to_ass_rgba, color_to_ssa_rgb, rgba_to_color, MAX_REPRESENTABLE_TIME, SubstationFormat, parse_timestamp
 import pytest
 
 
@@ -494,3 +497,85 @@ def test_empty_layer_issue_87() -> None:
     with pytest.warns(RuntimeWarning, match="Failed to parse layer"):
         subs = SSAFile.from_string(ASS_EMPTY_LAYERS_ISSUE_87)
     assert subs[0].layer == 0
+
+
+def test_iter_events() -> None:
+    ref = build_ref()
+
+    with tempfile.TemporaryDirectory() as dirpath:
+        path = op.join(dirpath, "test.ass")
+        with open(path, "w", encoding="utf-8") as fp:
+            fp.write(SIMPLE_ASS_REF)
+
+        header = SSAFile()
+        events = pysubs2.iter_events(path, header=header)
+        first_event = next(events)
+        assert header.format == "ass"
+        assert header.styles == ref.styles
+        assert header.info["My Custom Info"] == "Some: Test, String."
+        assert first_event.equals(ref[0])
+
+        rest = list(events)
+        assert len(rest) == 2
+        assert all(ev.equals(ref_ev) for ev, ref_ev in zip(rest, ref[1:]))
+        assert len(header) == 0
+
+
+def test_iter_events_non_streaming_format() -> None:
+    with tempfile.TemporaryDirectory() as dirpath:
+        path = op.join(dirpath, "test.json")
+        build_ref().save(path)
+
+        header = SSAFile()
+        events = list(pysubs2.iter_events(path, header=header))
+        assert header.format == "json"
+        assert len(header) == 0
+        assert len(events) == len(build_ref())
+        assert all(ev.equals(ev_ref) for ev, ev_ref in zip(events, build_ref()))
+
+
+def test_parse_timestamp() -> None:
+    assert parse_timestamp("0:00:00.00") == 0
+    assert parse_timestamp("1:23:45.67") == make_time(h=1, m=23, s=45, ms=670)
+    assert parse_timestamp(" 9:59:59.99 ") == MAX_REPRESENTABLE_TIME
+    assert parse_timestamp("-0:00:01.50") == -1500
+    assert parse_timestamp("0:00:01.5") == 1500
+    assert parse_timestamp("0:1:2.345") == make_time(m=1, s=2, ms=345)
+    assert parse_timestamp("0:01:02") == make_time(m=1, s=2)
+
+    with pytest.raises(ValueError):
+        parse_timestamp("0:0::02.34")
+    with pytest.raises(ValueError):
+        parse_timestamp("x:00:00.00")
+
+
+@pytest.mark.parametrize("filename", [
+    "subtitle_with_attached_fonts_pysubs2_ref.ass",
+    "subtitle_with_attached_images_pysubs2_ref.ass",
+    "ttml_example.ass",
+    "ttml_example2.ass",
+])
+def test_write_roundtrip_corpus(filename: str) -> None:
+    path = op.join(op.dirname(__file__), "..", "data", filename)
+    subs = SSAFile.load(path)
+    for format_ in ["ass", "ssa"]:
+        text = subs.to_string(format_)
+        assert SSAFile.from_string(text).to_string(format_) == text
+
+    with open(path, encoding="utf-8") as fp:
+        ref_text = fp.read()
+    if "pysubs2_ref" in filename:
+        assert subs.to_string("ass").strip() == ref_text.strip()
+
+
+def test_write_fields_with_unusual_types() -> None:
+    subs = SSAFile()
+    subs.styles["Default"] = SSAStyle(fontsize=20, scalex=100.5, bold=1, marginl=True)  # type: ignore[arg-type]
+    subs.append(SSAEvent(start=0, end=1000, layer=1.0, text="test"))  # type: ignore[arg-type]
+    text = subs.to_string("ass")
+    assert "Style: Default,Arial,20,&H00FFFFFF,&H000000FF,&H00000000,&H00000000,1,0,0,0,100.5,100,0,0,1,2,2,2,-1,10,10,1\n" in text
+    assert "Dialogue: 1,0:00:00.00,0:00:01.00,Default,,0,0,0,,test\n" in text
+
+    subs[0].text = None  # type: ignore[assignment]
+    with pytest.raises(TypeError):
+        subs.to_string("ass")
@@ -3,9 +3,14 @@ pysubs2.formats.ttml tests
 
 """
 
+import re
+import xml.etree.ElementTree as ET
+from typing import List
+
 import pytest
 import pysubs2
 from pysubs2 import SSAFile, SSAEvent, SSAStyle
+from pysubs2.formats.ttml import _serialize_xml
 import os.path as op
 
 
@@ -29,6 +34,38 @@ def test_example_parse(ttml_filename: str, ass_ref_filename: str) -> None:
     assert ass_text.strip() == ref_text.strip()
 
 
+TEST_TIME_INHERITANCE = """\
+<tt xmlns="http://www.w3.org/ns/ttml">
+  <head><metadata>ignored</metadata></head>
+  <body begin="1s">
+    <div begin="10s">
+      <p begin="1s" end="2s">First</p>
+      <p begin="00:00:03.000" duration="500ms">Second<br/>line</p>
+    </div>
+    <div>
+      <p end="1m">Third <span>with <span>nested</span> spans</span></p>
+    </div>
+    <p begin="0s" end="1s">Not in div</p>
+  </body>
+</tt>
+"""
+
+
+def test_time_inheritance() -> None:
+    subs = SSAFile.from_string(TEST_TIME_INHERITANCE)
+    assert [(e.start, e.end, e.text) for e in subs] == [
+        (12000, 13000, "First"),
+        (14000, 14500, "Second\\Nline"),
+        (1000, 61000, "Thirdwithnestedspans"),
+    ]
+
+    with open(get_data_path("ttml_example.ttml"), encoding="utf-8") as fp:
+        streamed = list(pysubs2.formats.ttml.TTMLFormat.iter_events(SSAFile(), fp, "ttml"))
+    ref = pysubs2.load(get_data_path("ttml_example.ttml"))
+    assert len(streamed) == len(ref)
+    assert all(e.equals(e_ref) for e, e_ref in zip(streamed, ref))
+
+
 TEST_SERIALIZE_REFERENCE = """
 <tt xmlns="http://www.w3.org/ns/ttml" xmlns:tts="http://www.w3.org/ns/ttml#styling">
   <head>
@@ -66,3 +103,29 @@ def test_serialize():
     ])
 
     assert subs.to_string("ttml").strip() == TEST_SERIALIZE_REFERENCE.strip()
+
+    compact_reference = re.sub(r">\s+<", "><", TEST_SERIALIZE_REFERENCE.strip())
+    assert subs.to_string("ttml", pretty_print=False).strip() == compact_reference
+
+    subs2 = SSAFile.from_string(subs.to_string("ttml", pretty_print=False))
+    assert [(e.start, e.end) for e in subs2] == [(e.start, e.end) for e in subs]
+
+
+def test_serialize_non_ascii() -> None:
+    elem = ET.Element("p", {"style": "Styl \"č.\u00a01\"\t<&>\n"})
+    elem.text = "Příliš žluťoučký <kůň> & 😀"
+    span = ET.SubElement(elem, "span")
+    span.text = "úpěl"
+    span.tail = "ďábelské ódy"
+    ET.SubElement(elem, "br")
+
+    output: List[str] = []
+    _serialize_xml(elem, output)
+    assert "".join(output) == ET.tostring(elem).decode("ascii")
+
+    subs = SSAFile()
+    subs.append(SSAEvent(start=0, end=1000, text="Příliš žluťoučký kůň"))
+    text = subs.to_string("ttml")
+    assert text.isascii()
+    assert "P&#345;&#237;li&#353;" in text
+    assert SSAFile.from_string(text)[0].text == "Příliš žluťoučký kůň"
@@ -3,7 +3,10 @@ test of SubStation [Fonts] handling
 
 """
 
+import pytest
+
 from pysubs2 import SSAFile
+from pysubs2.formats.substation import LazyAttachmentDict
 import os.path as op
 
 
@@ -54,6 +57,77 @@ def test_image_passthrough_from_aegisub() -> None:
     subs_pysubs2 = SSAFile.from_string(subs_pysubs2_text)
     assert subs_pysubs2_ref.equals(subs_pysubs2)
 
+def test_lazy_attachments() -> None:
+    for path in [FONT_SUBS_AEGISUB_PATH, FONT_SUBS_NO_EVENTS_PATH, IMAGE_SUBS_AEGISUB_PATH]:
+        subs_ref = SSAFile.load(path)
+        subs = SSAFile.load(path, lazy_attachments=True)
+        assert isinstance(subs.fonts_opaque, LazyAttachmentDict)
+        assert isinstance(subs.graphics_opaque, LazyAttachmentDict)
+        assert set(subs.fonts_opaque.keys()) == set(subs_ref.fonts_opaque.keys())
+        assert set(subs.graphics_opaque.keys()) == set(subs_ref.graphics_opaque.keys())
+        assert not any(subs.fonts_opaque.is_loaded(name) for name in subs.fonts_opaque)
+
+        assert subs.equals(subs_ref)
+        assert all(subs.fonts_opaque.is_loaded(name) for name in subs.fonts_opaque)
+        assert subs.to_string("ass") == subs_ref.to_string("ass")
+
+
+def test_lazy_attachments_from_string() -> None:
+    with open(FONT_SUBS_AEGISUB_PATH) as fp:
+        text = fp.read()
+
+    subs_ref = SSAFile.from_string(text)
+    subs = SSAFile.from_string(text, lazy_attachments=True)
+    assert isinstance(subs.fonts_opaque, LazyAttachmentDict)
+    assert subs.fonts_opaque.copy() == subs_ref.fonts_opaque
+    assert subs.equals(subs_ref)
+
+
+def test_skip_attachments() -> None:
+    subs_ref = SSAFile.load(FONT_SUBS_AEGISUB_PATH)
+    subs = SSAFile.load(FONT_SUBS_AEGISUB_PATH, skip_attachments=True, lazy_attachments=True)
+    assert not subs.fonts_opaque
+    assert not subs.graphics_opaque
+    assert len(subs) == len(subs_ref)
+    assert all(ev.equals(ev_ref) for ev, ev_ref in zip(subs, subs_ref))
+
+
+def test_mmap_attachments() -> None:
+    for path in [FONT_SUBS_AEGISUB_PATH, FONT_SUBS_NO_EVENTS_PATH, IMAGE_SUBS_AEGISUB_PATH]:
+        subs_ref = SSAFile.load(path)
+
+        subs = SSAFile.load(path, use_mmap=True)
+        assert not isinstance(subs.fonts_opaque, LazyAttachmentDict)
+        assert subs.equals(subs_ref)
+
+        subs = SSAFile.load(path, use_mmap=True, lazy_attachments=True)
+        assert isinstance(subs.fonts_opaque, LazyAttachmentDict)
+        assert isinstance(subs.graphics_opaque, LazyAttachmentDict)
+        assert not any(subs.fonts_opaque.is_loaded(name) for name in subs.fonts_opaque)
+        assert subs.equals(subs_ref)
+        with subs.fonts_opaque:
+            pass
+        subs.graphics_opaque.close()  # already closed, does nothing
+
+        subs = SSAFile.load(path, use_mmap=True, lazy_attachments=True)
+        assert isinstance(subs.fonts_opaque, LazyAttachmentDict)
+        attachments = subs.fonts_opaque if subs.fonts_opaque else subs.graphics_opaque
+        assert isinstance(attachments, LazyAttachmentDict)
+        attachments.close()
+        with pytest.raises(ValueError):
+            attachments[next(iter(attachments))]
+
+        subs = SSAFile.load(path, use_mmap=True, skip_attachments=True)
+        assert not subs.fonts_opaque
+        assert not subs.graphics_opaque
+        assert all(ev.equals(ev_ref) for ev, ev_ref in zip(subs, subs_ref))
+
+        with open(path, encoding="utf-8") as fp:
+            text = fp.read()
+        for data in [text.replace("\n", "\r\n").encode("utf-8-sig"), text.encode("utf-16")]:
+            assert SSAFile.from_bytes(data, lazy_attachments=True).equals(subs_ref)
+
+
 # the following tests would be useful if we supported fonts in a non-opaque way
 
 # GARAMOND_REGULAR_PATH = op.join(op.dirname(__file__), "data/EBGaramond08-Regular.ttf")
@@ -7,6 +7,8 @@ import subprocess
 import os.path as op
 from io import StringIO
 
+import pytest
+
 TEST_SRT_FILE = """\
 1
 00:00:00,000 --> 00:01:00,000
@@ -435,3 +437,66 @@ def test_win1250_passthrough_with_surrogateescape() -> None:
             output_bytes = fp.read()
 
         assert input_bytes_win1250 == output_bytes
+
+
+def test_parallel_conversion(capsys: Any) -> None:
+    N = 5
+    with tempfile.TemporaryDirectory() as dirpath:
+        inpaths = [op.join(dirpath, f"test-{i}.srt") for i in range(N)]
+        for inpath in inpaths:
+            with open(inpath, "w", encoding="utf-8") as fp:
+                fp.write(TEST_SRT_FILE)
+
+        invalid_path = op.join(dirpath, "invalid.srt")
+        with open(invalid_path, "w", encoding="utf-8") as fp:
+            fp.write("this is not a subtitle file")
+        missing_path = op.join(dirpath, "missing.srt")
+
+        cli = pysubs2.cli.Pysubs2CLI()
+        rv = cli(["--to", "microdvd", "--fps", "1000", "--jobs", "2", inpaths[0], missing_path, invalid_path]
+                 + inpaths[1:])
+        assert rv == 1
+
+        captured = capsys.readouterr()
+        assert captured.out == f"Skipping {missing_path} (does not exist)\n"
+        assert captured.err.startswith(f"Failed to convert {invalid_path} (FormatAutodetectionError")
+
+        for outpath in [p.replace(".srt", ".sub") for p in inpaths]:
+            with open(outpath, encoding="utf-8") as fp:
+                assert fp.read() == TEST_MICRODVD_FILE
+
+        rv = cli(["--to", "microdvd", "--fps", "1000", "--jobs", "0"] + inpaths)
+        assert rv == 0
+
+
+@pytest.mark.parametrize("jobs", ["0", "2"])
+def test_failed_conversion_exit_code(jobs: str, capsys: Any) -> None:
+    with tempfile.TemporaryDirectory() as dirpath:
+        inpath = op.join(dirpath, "test.srt")
+        with open(inpath, "w", encoding="utf-8") as fp:
+            fp.write(TEST_SRT_FILE)
+        invalid_path = op.join(dirpath, "invalid.srt")
+        with open(invalid_path, "w", encoding="utf-8") as fp:
+            fp.write("this is not a subtitle file")
+
+        cli = pysubs2.cli.Pysubs2CLI()
+        rv = cli(["--to", "microdvd", "--fps", "1000", "--jobs", jobs, invalid_path, inpath])
+        assert rv == 1
+        captured = capsys.readouterr()
+        assert captured.err.startswith(f"Failed to convert {invalid_path} (FormatAutodetectionError")
+        assert op.exists(inpath.replace(".srt", ".sub"))
+
+        rv = cli(["--to", "microdvd", "--fps", "1000", "--jobs", jobs, invalid_path])
+        assert rv == 1
+
+
+def test_failed_conversion_without_jobs() -> None:
+    with tempfile.TemporaryDirectory() as dirpath:
+        invalid_path = op.join(dirpath, "invalid.srt")
+        with open(invalid_path, "w", encoding="utf-8") as fp:
+            fp.write("this is not a subtitle file")
+
+        # by default, errors are not caught
+        cli = pysubs2.cli.Pysubs2CLI()
+        with pytest.raises(pysubs2.exceptions.FormatAutodetectionError):
+            cli(["--to", "microdvd", "--fps", "1000", invalid_path])
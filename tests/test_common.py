@@ -1,5 +1,8 @@
+import io
+from typing import Any
+
 from pysubs2 import Color
-from pysubs2.common import etree_register_namespace_override
+from pysubs2.common import etree_register_namespace_override, peek_text, PrefixedTextIO, iter_buffer_lines
 import pytest
 import xml.etree.ElementTree as ET
 
@@ -23,3 +26,53 @@ def test_etree_register_namespace_override() -> None:
         assert ET.tostring(test_xml_elem) == b'<test xmlns="http://my-namespace" />'
 
     assert ET.tostring(test_xml_elem) == b'<ns0:test xmlns:ns0="http://my-namespace" />'
+
+
+class NonSeekableTextIO(io.StringIO):
+    def seekable(self) -> bool:
+        return False
+
+    def seek(self, *args: Any) -> int:
+        raise io.UnsupportedOperation("not seekable")
+
+
+def test_peek_text() -> None:
+    fp = io.StringIO("skipped line\nfirst line\nsecond line\n")
+    fp.readline()
+    fragment, fp2 = peek_text(fp, 5)
+    assert fragment == "first"
+    assert fp2 is fp
+    assert fp.read() == "first line\nsecond line\n"
+
+    fp = NonSeekableTextIO("first line\nsecond line\n")
+    fragment, fp2 = peek_text(fp, 5)
+    assert fragment == "first"
+    assert isinstance(fp2, PrefixedTextIO)
+    assert list(fp2) == ["first line\n", "second line\n"]
+
+
+def test_prefixed_text_io() -> None:
+    def make() -> PrefixedTextIO:
+        return PrefixedTextIO("abc\nde", io.StringIO("f\nghi\n"))
+
+    assert make().read() == "abc\ndef\nghi\n"
+    assert make().read(None) == "abc\ndef\nghi\n"
+
+    fp = make()
+    assert [fp.read(2), fp.read(4), fp.read(3), fp.read(100), fp.read(1)] == ["ab", "c\nde", "f\ng", "hi\n", ""]
+
+    fp = make()
+    assert [fp.readline(), fp.readline(1), fp.readline(), fp.readline(), fp.readline()] == ["abc\n", "d", "ef\n", "ghi\n", ""]
+
+
+def test_iter_buffer_lines() -> None:
+    text = "first\r\nžluťoučký\rkůň\n\nlast"
+    for encoding in ["utf-8", "utf-8-sig", "cp1250"]:
+        data = text.encode(encoding)
+        expected = list(io.StringIO(text, newline=None))
+        for chunk_size in [1, 2, 3, 1000]:
+            assert list(iter_buffer_lines(data, encoding, chunk_size=chunk_size)) == expected
+
+    data = b"abc\ndef\nghi\n"
+    assert list(iter_buffer_lines(data, "ascii", start=4, end=8)) == ["def\n"]
+    assert list(iter_buffer_lines(data, "ascii", start=4, end=6)) == ["de"]
@@ -61,3 +61,28 @@ def test_no_drawing_tag() -> None:
     for fragment_text, fragment_style in fragments:
         assert fragment_text == "test"
         assert fragment_style.drawing is False
+
+
+def test_karaoke_shares_computed_style() -> None:
+    text = "".join(f"{{\\k10}}syl{i}" for i in range(100)) + "{\\i1}end"
+    fragments = parse_tags(text)
+    assert len(fragments) == 102
+    assert fragments[-1] == ("end", SSAStyle(italic=True))
+    assert all(sty is fragments[0][1] for _, sty in fragments[:-1])
+    assert fragments[0][1] == SSAStyle()
+
+
+def test_repeated_text() -> None:
+    styles = {"other style": SSAStyle(bold=True)}
+    text = "{\\rother style}Hello, {\\i1}world!"
+    first = parse_tags(text, styles=styles)
+    assert first == [("", SSAStyle()),
+                     ("Hello, ", SSAStyle(bold=True)),
+                     ("world!", SSAStyle(italic=True, bold=True))]
+
+    # computed styles are not shared between calls and follow changes in styles
+    first[1][1].underline = True
+    styles["other style"].strikeout = True
+    assert parse_tags(text, styles=styles) == [("", SSAStyle()),
+                                               ("Hello, ", SSAStyle(bold=True, strikeout=True)),
+                                               ("world!", SSAStyle(italic=True, bold=True, strikeout=True))]
@@ -1,3 +1,8 @@
+import copy
+import dataclasses
+import pickle
+import weakref
+
 import pytest
 
 from pysubs2 import SSAEvent, make_time
@@ -46,6 +51,36 @@ def test_plaintext() -> None:
     assert e.plaintext != text
 
 
+def test_is_drawing() -> None:
+    assert SSAEvent(text=r"{\p1}m 0 0 l 100 0 100 100 0 100{\p0}").is_drawing
+    assert SSAEvent(text=r"{\pos(10,10)\p2}m 0 0 l 1 1").is_drawing
+    assert not SSAEvent(text=r"{\pos(10,10)}text").is_drawing
+    assert not SSAEvent(text=r"{\p1\p0}text").is_drawing
+    assert not SSAEvent(text=r"{\p1\r}text").is_drawing
+    assert not SSAEvent(text=r"\p1 outside of override sequence").is_drawing
+
+
+def test_derived_properties_follow_text() -> None:
+    ev = SSAEvent(text=r"{\p1}m 0 0 l 1 1")
+    assert ev.is_drawing
+    assert ev.plaintext == "m 0 0 l 1 1"
+
+    ev.text = r"{\i1}Hello\Nworld"
+    assert not ev.is_drawing
+    assert ev.plaintext == "Hello\nworld"
+
+    ev.plaintext = "Hi"
+    assert ev.plaintext == "Hi"
+    ev.text += "!"
+    assert ev.plaintext == "Hi!"
+
+    ev2 = pickle.loads(pickle.dumps(ev))
+    assert ev2.plaintext == "Hi!"
+    ev2.text = "Bye"
+    assert ev2.plaintext == "Bye"
+    assert ev2.copy().plaintext == "Bye"
+
+
 def test_shift() -> None:
     e = SSAEvent(start=0, end=10)
 
@@ -86,3 +121,32 @@ def test_fields() -> None:
             "start", "end", "text", "marked", "layer", "style",
             "name", "marginl", "marginr", "marginv", "effect", "type"
         ])
+
+
+def test_slots() -> None:
+    ev = SSAEvent(start=0, end=1000, text="Hello")
+    assert not hasattr(ev, "__dict__")
+    with pytest.raises(AttributeError):
+        ev.nonexistent_field = 42  # type: ignore[attr-defined]
+
+    ev2 = pickle.loads(pickle.dumps(ev))
+    assert ev2.equals(ev)
+    assert copy.copy(ev).equals(ev)
+    assert weakref.ref(ev)() is ev
+
+    # private caches are not dataclass fields
+    assert ev.plaintext == "Hello"
+    assert not any(field.name.startswith("_") for field in dataclasses.fields(ev))
+    assert dataclasses.asdict(ev) == ev.as_dict()
+    assert dataclasses.replace(ev, text="Bye").plaintext == "Bye"
+
+
+@pytest.mark.parametrize("protocol", range(pickle.HIGHEST_PROTOCOL + 1))
+def test_pickle(protocol: int) -> None:
+    ev = SSAEvent(start=0, end=1000, text=r"{\i1}Hello", marked=True)
+    assert ev.plaintext == "Hello"
+    ev2 = pickle.loads(pickle.dumps(ev, protocol))
+    assert ev2.equals(ev)
+    assert ev2.plaintext == "Hello"
+    ev2.text = "Bye"
+    assert ev2.plaintext == "Bye"
@@ -1,5 +1,11 @@
+import io
+import os.path as op
+import tempfile
+from typing import Any
+
 import pytest
 
+import pysubs2
 from pysubs2 import SSAFile, SSAStyle, SSAEvent, make_time
 
 
@@ -92,6 +98,54 @@ def test_rename_style() -> None:
         subs.rename_style("nonexistent-style", "blue")
 
 
+def test_select() -> None:
+    subs = SSAFile()
+    subs.append(SSAEvent(start=0, end=1000, style="Default", text="a"))
+    subs.append(SSAEvent(start=1000, end=2000, style="Signs", layer=1, text="b"))
+    subs.append(SSAEvent(start=2000, end=3000, style="Signs", text="c"))
+    subs.append(SSAEvent(start=2500, end=2500, style="Default", text="d"))
+
+    assert subs.select() == [0, 1, 2, 3]
+    assert subs.select(style="Signs") == [1, 2]
+    assert subs.select(style="Signs", layer=0) == [2]
+    assert subs.select(time_range=(500, 2500)) == [0, 1, 2]
+    assert subs.select(time_range=(500, 2500), indices=[3, 2, 0, 2]) == [0, 2]
+    assert subs.select(indices=[3, 1]) == [1, 3]
+    assert subs.select(predicate=lambda line: line.text in "cd", style="Default") == [3]
+    with pytest.raises(IndexError):
+        subs.select(indices=[4])
+
+    subs.shift(ms=100, selection=subs.select(style="Signs"))
+    subs.transform_framerate(1, 2, selection=[0, 1])
+    assert [(line.start, line.end) for line in subs] == [(0, 500), (550, 1050), (2100, 3100), (2500, 2500)]
+    assert subs.at(2100) == [subs[2]]
+
+    subs.shift(ms=100, selection=[3, 3, 3])
+    assert subs[3].start == 2600
+
+
+def test_retime() -> None:
+    def build() -> SSAFile:
+        subs = SSAFile()
+        for i in range(10):
+            subs.append(SSAEvent(start=i * 1000, end=i * 1000 + 500))
+        return subs
+
+    anchors = [(0, 0), (4000, 4000), (8000, 9000)]
+    subs = build()
+    ref = build()
+    timings = ref.get_timings()
+    timings.map_piecewise(anchors)
+    ref.set_timings(timings)
+
+    assert subs.retime(anchors) == 6  # subtitles 4..9 move
+    assert subs.equals(ref)
+    assert subs[9].start == 10250
+    assert subs.retime(anchors, selection=[0, 1]) == 0
+    assert subs.retime([(0, 100)], selection=[0, 1]) == 2
+    assert [line.start for line in subs[:3]] == [100, 1100, 2000]
+
+
 def test_transform_framerate() -> None:
     subs = SSAFile()
     subs.append(SSAEvent(start=0, end=10))
@@ -147,3 +201,217 @@ def test_slice_api() -> None:
     assert subs[0].text == "X"
     assert subs[1].text == "Y"
     assert subs[2].text == "Z"
+
+
+def test_remove_miscellaneous_events() -> None:
+    subs = SSAFile()
+    subs.append(SSAEvent(start=0, end=1000, text="{\\i1}Hello{\\i0}", type="Comment"))
+    subs.append(SSAEvent(start=0, end=1000, text="Hello"))  # same as comment above
+    subs.append(SSAEvent(start=0, end=1000, text="{\\pos(1,1)}World"))
+    subs.append(SSAEvent(start=0, end=1000, text="World"))
+    subs.append(SSAEvent(start=0, end=2000, text="World"))
+    subs.append(SSAEvent(start=0, end=1000, text="{\\p1}m 0 0 l 1 1"))
+    subs.append(SSAEvent(start=0, end=1000, text="{\\an8}x"))
+    subs.remove_miscellaneous_events()
+    assert [(line.text, line.end) for line in subs] == [("{\\pos(1,1)}World", 1000), ("World", 2000)]
+
+
+def test_diff() -> None:
+    def build() -> SSAFile:
+        subs = SSAFile()
+        subs.info["Title"] = "Test"
+        subs.styles["Other"] = SSAStyle(bold=True)
+        subs.fonts_opaque["font.ttf"] = ["abc"]
+        for i in range(5):
+            subs.append(SSAEvent(start=i * 1000, end=i * 1000 + 500, text=f"Line {i}"))
+        return subs
+
+    subs, other = build(), build()
+    other.info["ScriptType"] = "v4.00"  # ignored
+    assert subs.equals(other)
+    assert not subs.diff(other)
+    assert subs.fingerprint() == other.fingerprint()
+
+    other.info["Title"] = "Changed"
+    other.styles["Other"].primarycolor.r = 1
+    other.graphics_opaque["image.png"] = ["def"]
+    other[1].text = "Changed"
+    other[3].end += 1
+    other.append(SSAEvent(start=9000, end=9500))
+    diff = subs.diff(other)
+    assert diff
+    assert diff.info == ["Title"]
+    assert diff.styles == ["Other"]
+    assert diff.fonts_opaque == []
+    assert diff.graphics_opaque == ["image.png"]
+    assert diff.events == [1, 3, 5]
+    assert not subs.equals(other)
+    assert subs.fingerprint() != other.fingerprint()
+    assert [ev.fingerprint() == ev_other.fingerprint() for ev, ev_other in zip(subs, other)] == [
+        True, False, True, False, True]
+
+    with pytest.raises(TypeError):
+        subs.diff([])  # type: ignore[arg-type]
+
+
+def test_fingerprint_is_stable() -> None:
+    # fingerprints don't depend on hash randomization, so they can be stored
+    subs = SSAFile()
+    subs.append(SSAEvent(text="x"))
+    assert subs.fingerprint() == 17206183247050985197
+    assert SSAEvent().fingerprint() == 17412644777762821511
+    assert SSAStyle().fingerprint() == 11808549349965090063
+
+    # values which compare equal give the same fingerprint
+    other = SSAFile()
+    other.append(SSAEvent(start=0.0, end=10000.0, text="x", marked=0))  # type: ignore[arg-type]
+    other.info = dict(reversed(list(subs.info.items())))
+    assert subs.equals(other)
+    assert subs.fingerprint() == other.fingerprint()
+    assert SSAEvent(marked=True).equals(SSAEvent(marked=1))  # type: ignore[arg-type]
+    assert SSAEvent(marked=True).fingerprint() == SSAEvent(marked=1).fingerprint()  # type: ignore[arg-type]
+
+
+def test_sort() -> None:
+    subs = SSAFile()
+    for start in [0, 1000, 2000]:
+        subs.append(SSAEvent(start=start, end=start + 500))
+    assert subs.is_sorted()
+    assert subs.at(250) == [subs[0]]
+
+    # times changed in-place without changing the order, sort() must not keep stale cached data
+    subs[0].end = 900
+    subs[1].start = 950
+    subs.sort()
+    assert subs.at(850) == [subs[0]]
+    assert subs.at(960) == [subs[1]]
+    assert subs.between(0, 960) == [subs[0], subs[1]]
+
+    subs.append(SSAEvent(start=1000, end=400))
+    subs[0].start = 3000
+    assert not subs.is_sorted()
+    subs.sort()
+    assert subs.is_sorted()
+    assert [(e.start, e.end) for e in subs] == [(950, 1500), (1000, 400), (2000, 2500), (3000, 900)]
+    assert subs.at(1000) == [subs[0]]
+
+
+def test_time_queries() -> None:
+    subs = SSAFile()
+    subs.append(SSAEvent(start=0, end=1000, text="A"))
+    subs.append(SSAEvent(start=500, end=1500, text="B", type="Comment"))
+    subs.append(SSAEvent(start=2000, end=2000, text="C"))
+
+    assert [ev.text for ev in subs.at(0)] == ["A"]
+    assert [ev.text for ev in subs.at(999)] == ["A", "B"]
+    assert [ev.text for ev in subs.at(1000)] == ["B"]
+    assert subs.at(2000) == []
+    assert [ev.text for ev in subs.between(900, 2100)] == ["A", "B"]
+    assert subs.between(1000, 1000) == []
+
+    # index is rebuilt after modification via SSAFile methods
+    subs.shift(ms=100)
+    assert [ev.text for ev in subs.at(50)] == []
+    subs.insert(0, SSAEvent(start=0, end=100, text="D"))
+    assert [ev.text for ev in subs.at(50)] == ["D"]
+    del subs[0]
+    assert subs.at(50) == []
+    subs.sort()
+    subs[0] = SSAEvent(start=0, end=100, text="E")
+    assert [ev.text for ev in subs.at(50)] == ["E"]
+    subs.events = [SSAEvent(start=0, end=100, text="F")]
+    assert [ev.text for ev in subs.at(50)] == ["F"]
+
+    # in-place changes need explicit invalidation
+    subs[0].end = 10
+    subs.invalidate_caches()
+    assert subs.at(50) == []
+
+
+def test_from_file_non_seekable() -> None:
+    class Pipe(io.StringIO):
+        def seekable(self) -> bool:
+            return False
+
+        def seek(self, *args: Any) -> int:
+            raise io.UnsupportedOperation("not seekable")
+
+        def tell(self) -> int:
+            raise io.UnsupportedOperation("not seekable")
+
+    ref = SSAFile()
+    for i in range(1000):
+        ref.append(SSAEvent(start=i * 1000, end=i * 1000 + 500, text=f"Subtitle {i}"))
+
+    for format_ in ["srt", "ass", "ttml"]:
+        subs = SSAFile.from_file(Pipe(ref.to_string(format_)))
+        assert subs.format == format_
+        assert len(subs) == len(ref)
+        assert all(ev.equals(ev_ref) for ev, ev_ref in zip(subs, ref))
+
+
+def test_from_bytes() -> None:
+    ref = SSAFile()
+    ref.append(SSAEvent(start=0, end=1000, text="Příliš žluťoučký kůň"))
+    ref.append(SSAEvent(start=1000, end=2000, text="úpěl ďábelské ódy"))
+    text = ref.to_string("srt")
+
+    for data, expected_encoding in [(text.encode("utf-8"), "utf-8"),
+                                    (text.encode("utf-8-sig"), "utf-8-sig"),
+                                    (text.encode("utf-16"), "utf-16"),
+                                    (text.replace("\n", "\r\n").encode("cp1250"), "cp1250")]:
+        assert pysubs2.common.detect_encoding(data, ["utf-8", "cp1250"]) == expected_encoding
+        subs = SSAFile.from_bytes(data, encoding_candidates=["utf-8", "cp1250"])
+        assert subs.format == "srt"
+        assert subs.equals(ref)
+
+    subs = SSAFile.from_bytes(text.encode("cp1250"), encoding="cp1250")
+    assert subs.equals(ref)
+
+    with tempfile.TemporaryDirectory() as dirpath:
+        path = op.join(dirpath, "test.srt")
+        with open(path, "w", encoding="cp1250") as fp:
+            fp.write(text)
+
+        subs = SSAFile.load(path, encoding="auto", encoding_candidates=["utf-8", "cp1250"])
+        assert subs.equals(ref)
+        events = list(pysubs2.iter_events(path, encoding="auto", encoding_candidates=["utf-8", "cp1250"]))
+        assert all(ev.equals(ev_ref) for ev, ev_ref in zip(events, ref))
+
+
+def test_load_mmap() -> None:
+    ref = SSAFile()
+    ref.append(SSAEvent(start=0, end=1000, text="Příliš {\\i1}žluťoučký{\\i0} kůň"))
+    ref.append(SSAEvent(start=1000, end=2000, text="úpěl\\Nďábelské ódy"))
+    ref.append(SSAEvent(start=2000, end=3000, text=""))
+    ref.append(SSAEvent(start=3000, end=4000, text="12"))
+    text = ref.to_string("srt")
+
+    with tempfile.TemporaryDirectory() as dirpath:
+        path = op.join(dirpath, "test.srt")
+        for newline in ["\n", "\r\n"]:
+            for encoding in ["utf-8", "utf-8-sig", "cp1250", "utf-16"]:
+                with open(path, "w", encoding=encoding, newline=newline) as fp:
+                    fp.write(text)
+
+                subs = SSAFile.load(path, encoding=encoding, use_mmap=True)
+                assert subs.format == "srt"
+                assert subs.equals(ref)
+                subs = SSAFile.load(path, encoding="auto", use_mmap=True, encoding_candidates=["utf-8", "cp1250"])
+                assert subs.equals(ref)
+
+        with open(path, "w") as fp:
+            pass
+        with pytest.raises(pysubs2.exceptions.FormatAutodetectionError):
+            SSAFile.load(path, use_mmap=True)
+
+
+def test_detect_encoding_prefix() -> None:
+    data = "x".encode() * (pysubs2.common.ENCODING_DETECTION_PREFIX_SIZE - 1) + "ř".encode()
+    # multi-byte character cut at the end of prefix is not an error...
+    assert pysubs2.common.detect_encoding(data, ["utf-8", "cp1250"]) == "utf-8"
+    # ...unless it's the end of data
+    assert pysubs2.common.detect_encoding(data[:-1], ["utf-8", "cp1250"]) == "cp1250"
+
+    with pytest.raises(ValueError):
+        pysubs2.common.detect_encoding(data, [])
@@ -41,3 +41,10 @@ def test_fields() -> None:
 
             "drawing"
         ])
+
+
+def test_fingerprint() -> None:
+    style = SSAStyle(italic=True)
+    assert style.fingerprint() == SSAStyle(italic=True).fingerprint()
+    style.primarycolor.a = 10
+    assert style.fingerprint() != SSAStyle(italic=True).fingerprint()
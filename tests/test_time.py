@@ -6,8 +6,9 @@ import typing
 from fractions import Fraction
 import pytest
 
+import pysubs2.time
 from pysubs2.time import TIMESTAMP, TIMESTAMP_SHORT, timestamp_to_ms, times_to_ms, ms_to_times, Times, frames_to_ms, \
-    ms_to_frames, ms_to_str
+    ms_to_frames, ms_to_str, memoize_timestamp_format, timestamp_cache_info, clear_timestamp_caches
 
 
 # helper functions
@@ -201,3 +202,39 @@ def test_ms_to_str() -> None:
     assert ms_to_str(-h2ms(1)) == "-1:00:00"
     assert ms_to_str(-h2ms(1), fractions=True) == "-1:00:00.000"
     assert ms_to_str(h2ms(1000)) == "1000:00:00"
+
+
+def test_memoize_timestamp_format(monkeypatch: pytest.MonkeyPatch) -> None:
+    # register the throwaway function in a copy of the registry, which is restored after the test
+    monkeypatch.setattr(pysubs2.time, "_TIMESTAMP_CACHES", dict(pysubs2.time._TIMESTAMP_CACHES))
+    calls = []
+
+    @memoize_timestamp_format
+    def format_seconds(ms: int) -> str:
+        calls.append(ms)
+        return f"{ms // 1000}s"
+
+    assert format_seconds(1000) == "1s"
+    assert format_seconds(2000) == "2s"
+    assert format_seconds(1000) == "1s"
+    assert calls == [1000, 2000]
+
+    info = timestamp_cache_info()[f"{__name__}.test_memoize_timestamp_format.<locals>.format_seconds"]
+    assert (info.hits, info.misses) == (1, 2)
+
+    clear_timestamp_caches()
+    assert format_seconds(1000) == "1s"
+    assert calls == [1000, 2000, 1000]
+
+
+def test_timestamp_cache_used_by_writers() -> None:
+    from pysubs2 import SSAFile, SSAEvent
+
+    subs = SSAFile()
+    subs.append(SSAEvent(start=0, end=1000))
+    subs.append(SSAEvent(start=1000, end=2000))
+
+    clear_timestamp_caches()
+    subs.to_string("srt")
+    info = timestamp_cache_info()["pysubs2.formats.subrip._format_timestamp"]
+    assert (info.hits, info.misses) == (1, 3)
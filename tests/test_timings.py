@@ -0,0 +1,145 @@
+"""
+pysubs2.timings tests
+
+"""
+import random
+
+import pytest
+
+from pysubs2 import SSAFile, SSAEvent
+from pysubs2.timings import EventTimings, IntervalIndex
+
+
+def build_subs() -> SSAFile:
+    subs = SSAFile()
+    subs.append(SSAEvent(start=1000, end=2000, text="B"))
+    subs.append(SSAEvent(start=0, end=1000, text="A"))
+    subs.append(SSAEvent(start=1000, end=1500, text="C"))
+    return subs
+
+
+def test_get_set_timings() -> None:
+    subs = build_subs()
+    timings = subs.get_timings()
+    assert len(timings) == 3
+    assert list(timings.starts) == [1000, 0, 1000]
+    assert list(timings.ends) == [2000, 1000, 1500]
+    assert timings[1] == (0, 1000)
+
+    timings.shift(500)
+    assert subs[0].start == 1000  # not applied yet
+    assert subs.set_timings(timings) == 3
+    assert [(ev.start, ev.end) for ev in subs] == [(1500, 2500), (500, 1500), (1500, 2000)]
+    assert subs.set_timings(timings) == 0
+
+    with pytest.raises(ValueError):
+        subs.set_timings(EventTimings([0], [1]))
+
+
+def test_scale() -> None:
+    subs = build_subs()
+    timings = subs.get_timings()
+    timings.scale(0.5)
+    subs.set_timings(timings)
+
+    ref = build_subs()
+    ref.transform_framerate(10, 20)
+    assert subs.get_timings() == ref.get_timings()
+
+
+def test_indices() -> None:
+    timings = build_subs().get_timings()
+    timings.shift(500, indices=[0, 2])
+    timings.scale(2, indices=[1, 2])
+    assert list(timings) == [(1500, 2500), (0, 2000), (3000, 4000)]
+
+
+def test_duplicate_indices() -> None:
+    timings = build_subs().get_timings()
+    timings.shift(500, indices=[0, 0, 2])
+    timings.scale(2, indices=[1, 2, 1])
+    timings.map_piecewise([(0, 0), (1000, 2000)], indices=[1, 1])
+    assert list(timings) == [(1500, 2500), (0, 4000), (3000, 4000)]
+
+
+def test_map_piecewise() -> None:
+    timings = EventTimings([0, 1000, 2000, 3000, 5000], [500, 1500, 2500, 4000, 6000])
+    anchors = [(1000, 1000), (3000, 4000)]
+    mapped = timings.copy()
+    mapped.map_piecewise(anchors)
+    # slope 1.5, extrapolated at both ends
+    assert list(mapped.starts) == [-500, 1000, 2500, 4000, 7000]
+    assert list(mapped.ends) == [250, 1750, 3250, 5500, 8500]
+
+    mapped = timings.copy()
+    mapped.map_piecewise([(0, 0), (1000, 2000), (2000, 2000)], indices=[1, 2, 3])
+    assert list(mapped.starts) == [0, 2000, 2000, 2000, 5000]
+    assert list(mapped.ends) == [500, 2000, 2000, 2000, 6000]
+
+    mapped = timings.copy()
+    mapped.map_piecewise([(100, 200)])
+    shifted = timings.copy()
+    shifted.shift(100)
+    assert mapped == shifted
+
+    # unsorted times jumping back and forth over many segments
+    anchors = [(i * 1000, i * 1500) for i in range(10)]
+    times = [9500, 0, 8000, 500, 1500, 2500, 12000, -1000, 7999]
+    mapped = EventTimings(times, times)
+    mapped.map_piecewise(anchors)
+    assert list(mapped.starts) == [round(t * 1.5) for t in times]
+
+    with pytest.raises(ValueError):
+        timings.map_piecewise([])
+    with pytest.raises(ValueError):
+        timings.map_piecewise([(1000, 0), (1000, 1000)])
+
+
+def test_argsort() -> None:
+    subs = build_subs()
+    order = subs.get_timings().argsort()
+    assert order == [1, 2, 0]
+    subs.sort()
+    assert [ev.text for ev in subs] == ["A", "C", "B"]
+
+
+def test_overlapping() -> None:
+    timings = build_subs().get_timings()
+    assert timings.overlapping(0, 1) == [1]
+    assert timings.overlapping(1000, 1001) == [0, 2]
+    assert timings.overlapping(999, 1600) == [0, 1, 2]
+    assert timings.overlapping(2000, 3000) == []
+
+
+def test_non_integer_times() -> None:
+    timings = EventTimings([0.4, 1.6], [1000, 2000.5])
+    assert list(timings.starts) == [0, 2]
+    assert list(timings.ends) == [1000, 2000]
+
+    copy = timings.copy()
+    copy.shift(1)
+    assert copy != timings
+
+    with pytest.raises(ValueError):
+        EventTimings([0], [])
+
+
+def test_interval_index() -> None:
+    rng = random.Random(42)
+    starts = [rng.randint(0, 10_000) for _ in range(500)]
+    ends = [s + rng.randint(-100, 1000) for s in starts]
+    timings = EventTimings(starts, ends)
+    index = IntervalIndex(timings)
+    assert index.size == 500
+
+    for _ in range(200):
+        t = rng.randint(-100, 12_000)
+        assert index.at(t) == timings.overlapping(t, t + 1)
+        duration = rng.randint(0, 2000)
+        assert index.between(t, t + duration) == timings.overlapping(t, t + duration)
+
+
+def test_interval_index_empty() -> None:
+    index = IntervalIndex(EventTimings())
+    assert index.at(0) == []
+    assert index.between(0, 1000) == []